@@ -1,12 +1,37 @@
 import Axios from 'axios';
 import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
 
+const JOB_POLL_INTERVAL = 2000;
+const CONTENT_LIST_FIELDS = 'title,channel,type,status,likes,shares,clicks,impressions,created_at';
+const CONTENT_PAGE_SIZE = 50;
+
+const fetchContentsPage = async (cursor) => {
+  const { data, headers } = await Axios.get('/contents', {
+    params: { fields: CONTENT_LIST_FIELDS, limit: CONTENT_PAGE_SIZE, cursor },
+    withCredentials: true,
+  });
+  return { contents: data, nextCursor: headers['x-next-cursor'] || null };
+};
+
+const waitForJob = async (job) => {
+  while (true) {
+    const { data } = await Axios.get(`/job/${job.id}`, { withCredentials: true });
+    if (data.status === 'completed') {
+      return data.content;
+    }
+    if (data.status === 'failed') {
+      throw new Error(data.error || 'Content generation failed.');
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL));
+  }
+};
+
 export const createContent = createAsyncThunk(
   '/content/create',
   async ( contentData, { rejectWithValue }) => {
     try {
       const { data } = await Axios.post('/content/create', contentData, { withCredentials: true });
-      return data;
+      return await waitForJob(data);
     } catch (err) {
       return rejectWithValue(err.response?.data?.message || err.message);
     }
@@ -29,8 +54,8 @@ export const updateContent = createAsyncThunk(
   '/content/update',
   async ({ id, contentData }, { rejectWithValue }) => {
     try {
-      const { data } = await Axios.put(`/content/${id}`, contentData, { withCredentials: true });
-      return data;
+      const { data, status } = await Axios.put(`/content/${id}`, contentData, { withCredentials: true });
+      return status === 202 ? await waitForJob(data) : data;
     } catch (err) {
       return rejectWithValue(err.response?.data?.message || err.message);
     }
@@ -53,17 +78,33 @@ export const getContents = createAsyncThunk(
   '/contents/all',
   async (_, { rejectWithValue }) => {
     try {
-      const { data } = await Axios.get('/contents', { withCredentials: true });
-      return data;
+      return await fetchContentsPage(null);
+    } catch (err) {
+      return rejectWithValue(err.response?.data?.message || err.message);
+    }
+  }
+);
+
+export const getMoreContents = createAsyncThunk(
+  '/contents/more',
+  async (_, { getState, rejectWithValue }) => {
+    try {
+      return await fetchContentsPage(getState().content.nextCursor);
     } catch (err) {
       return rejectWithValue(err.response?.data?.message || err.message);
     }
+  },
+  {
+    condition: (_, { getState }) => {
+      const { nextCursor, loadingMore } = getState().content;
+      return Boolean(nextCursor) && !loadingMore;
+    },
   }
 );
 
 const contentSlice = createSlice({
   name: 'content',
-  initialState: { loading: false, contents: [], content: null, error: null },
+  initialState: { loading: false, loadingMore: false, contents: [], nextCursor: null, content: null, error: null },
   extraReducers: (builder) => {
     builder
         .addCase(createContent.pending, (state) => {
@@ -133,13 +174,29 @@ const contentSlice = createSlice({
         })
         .addCase(getContents.fulfilled, (state, action) => {
             state.loading = false;
-            state.contents = action.payload;
+            state.contents = action.payload.contents;
+            state.nextCursor = action.payload.nextCursor;
             state.error = null;
         })
         .addCase(getContents.rejected, (state, action) => {
             state.loading = false;
             state.error = action.payload;
         })
+
+        .addCase(getMoreContents.pending, (state) => {
+            state.loadingMore = true;
+            state.error = null;
+        })
+        .addCase(getMoreContents.fulfilled, (state, action) => {
+            state.loadingMore = false;
+            state.contents.push(...action.payload.contents);
+            state.nextCursor = action.payload.nextCursor;
+            state.error = null;
+        })
+        .addCase(getMoreContents.rejected, (state, action) => {
+            state.loadingMore = false;
+            state.error = action.payload;
+        })
   },
 });
 
@@ -1,6 +1,17 @@
 import Axios from 'axios';
 import { createSlice, createAsyncThunk } from '@reduxjs/toolkit';
 
+const PRODUCT_LIST_FIELDS = 'name,category,price,currency,sales';
+const PRODUCT_PAGE_SIZE = 50;
+
+const fetchProductsPage = async (cursor) => {
+  const { data, headers } = await Axios.get('/products', {
+    params: { fields: PRODUCT_LIST_FIELDS, limit: PRODUCT_PAGE_SIZE, cursor },
+    withCredentials: true,
+  });
+  return { products: data, nextCursor: headers['x-next-cursor'] || null };
+};
+
 export const createProduct = createAsyncThunk(
   '/product/create',
   async ( productData, { rejectWithValue }) => {
@@ -53,17 +64,33 @@ export const getProducts = createAsyncThunk(
   '/products/all',
   async (_, { rejectWithValue }) => {
     try {
-      const { data } = await Axios.get('/products', { withCredentials: true });
-      return data;
+      return await fetchProductsPage(null);
+    } catch (err) {
+      return rejectWithValue(err.response?.data?.message || err.message);
+    }
+  }
+);
+
+export const getMoreProducts = createAsyncThunk(
+  '/products/more',
+  async (_, { getState, rejectWithValue }) => {
+    try {
+      return await fetchProductsPage(getState().product.nextCursor);
     } catch (err) {
       return rejectWithValue(err.response?.data?.message || err.message);
     }
+  },
+  {
+    condition: (_, { getState }) => {
+      const { nextCursor, loadingMore } = getState().product;
+      return Boolean(nextCursor) && !loadingMore;
+    },
   }
 );
 
 const productSlice = createSlice({
   name: 'product',
-  initialState: { loading: false, products: [], product: null, error: null },
+  initialState: { loading: false, loadingMore: false, products: [], nextCursor: null, product: null, error: null },
   extraReducers: (builder) => {
     builder
         .addCase(createProduct.pending, (state) => {
@@ -133,13 +160,29 @@ const productSlice = createSlice({
         })
         .addCase(getProducts.fulfilled, (state, action) => {
             state.loading = false;
-            state.products = action.payload;
+            state.products = action.payload.products;
+            state.nextCursor = action.payload.nextCursor;
             state.error = null;
         })
         .addCase(getProducts.rejected, (state, action) => {
             state.loading = false;
             state.error = action.payload;
         })
+
+        .addCase(getMoreProducts.pending, (state) => {
+            state.loadingMore = true;
+            state.error = null;
+        })
+        .addCase(getMoreProducts.fulfilled, (state, action) => {
+            state.loadingMore = false;
+            state.products.push(...action.payload.products);
+            state.nextCursor = action.payload.nextCursor;
+            state.error = null;
+        })
+        .addCase(getMoreProducts.rejected, (state, action) => {
+            state.loadingMore = false;
+            state.error = action.payload;
+        })
   },
 });
 
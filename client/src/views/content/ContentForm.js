@@ -9,7 +9,9 @@ import { Close as CloseIcon, ChevronRight as ChevronRightIcon } from "@mui/icons
 import { IconButton, Card, Divider, Alert, LinearProgress, TextField, Button, Container, Typography, Box, MenuItem, Select, FormControl, InputLabel, Grid, Chip, FormHelperText, Tab, Tabs, Paper} from "@mui/material";
 
 import Sidebar from "../../components/Sidebar";
-import { getProducts } from "../../slices/productSlice";
+import { getProducts, getMoreProducts } from "../../slices/productSlice";
+
+const LOAD_MORE_PRODUCTS = "__load_more__";
 import { createContent, updateContent, getContent } from "../../slices/contentSlice";
 
 const ContentForm = () => {
@@ -19,7 +21,7 @@ const ContentForm = () => {
   const navigate = useNavigate();
 
   const { content, loading, error } = useSelector((state) => state.content);
-  const { products } = useSelector((state) => state.product);
+  const { products, nextCursor: nextProductCursor } = useSelector((state) => state.product);
 
   const [activeTab, setActiveTab] = useState(0);
   const [title, setTitle] = useState("");
@@ -346,7 +348,13 @@ const ContentForm = () => {
                       <Select
                         value={productId}
                         label="Product"
-                        onChange={(e) => setProductId(e.target.value)}
+                        onChange={(e) => {
+                          if (e.target.value === LOAD_MORE_PRODUCTS) {
+                            dispatch(getMoreProducts());
+                          } else {
+                            setProductId(e.target.value);
+                          }
+                        }}
                       >
                         <MenuItem value="">None</MenuItem>
                         {products.map((product) => (
@@ -354,6 +362,11 @@ const ContentForm = () => {
                             {product.name}
                           </MenuItem>
                         ))}
+                        {nextProductCursor && (
+                          <MenuItem value={LOAD_MORE_PRODUCTS} sx={{ fontStyle: "italic" }}>
+                            Load more products...
+                          </MenuItem>
+                        )}
                       </Select>
                     </FormControl>
                   </Grid>
@@ -6,13 +6,13 @@ import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, CartesianGri
 import { Grid, Card, CardContent, Alert, LinearProgress, Divider, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, IconButton, Button, Typography, Box, Dialog, DialogActions, DialogContent, DialogContentText, DialogTitle } from '@mui/material';
 
 import Sidebar from "../../components/Sidebar";
-import { getContents, deleteContent } from '../../slices/contentSlice';
+import { getContents, getMoreContents, deleteContent } from '../../slices/contentSlice';
 
 const ContentList = () => {
     const dispatch = useDispatch();
     const navigate = useNavigate();
 
-    const { contents, loading, error } = useSelector(state => state.content);
+    const { contents, nextCursor, loading, loadingMore, error } = useSelector(state => state.content);
 
     const [open, setOpen] = useState(false);
     const [selectedContent, setSelectedContent] = useState(null);
@@ -119,6 +119,13 @@ const ContentList = () => {
               </Table>
             </TableContainer>
           )}
+          {nextCursor && (
+            <Box sx={{ display: "flex", justifyContent: "center", mt: 2 }}>
+              <Button variant="outlined" onClick={() => dispatch(getMoreContents())} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load More"}
+              </Button>
+            </Box>
+          )}
 
           <Grid container spacing={3} sx={{ mt: 3 }}>
             <Grid item xs={12} md={6}>
@@ -6,13 +6,13 @@ import { Edit as EditIcon, Delete as DeleteIcon, Add as AddIcon } from '@mui/ico
 import { Alert, LinearProgress, Divider, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, Paper, IconButton, Button, Typography, Box, Dialog, DialogActions, DialogContent, DialogContentText, DialogTitle } from '@mui/material';
 
 import Sidebar from "../../components/Sidebar";
-import { getProducts, deleteProduct } from '../../slices/productSlice';
+import { getProducts, getMoreProducts, deleteProduct } from '../../slices/productSlice';
 
 const ProductList = () => {
     const dispatch = useDispatch();
     const navigate = useNavigate();
 
-    const { products, loading, error } = useSelector(state => state.product);
+    const { products, nextCursor, loading, loadingMore, error } = useSelector(state => state.product);
 
     const [open, setOpen] = useState(false);
     const [selectedProduct, setSelectedProduct] = useState(null);
@@ -98,6 +98,13 @@ const ProductList = () => {
               </Table>
             </TableContainer>
           )}
+          {nextCursor && (
+            <Box sx={{ display: "flex", justifyContent: "center", mt: 2 }}>
+              <Button variant="outlined" onClick={() => dispatch(getMoreProducts())} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load More"}
+              </Button>
+            </Box>
+          )}
           {chartData.length > 0 && (
               <Paper elevation={2} sx={{ my: 2, p: 3 }}>
                   <Typography variant="h6" fontWeight="bold">
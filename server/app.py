@@ -5,7 +5,7 @@ from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
 app = Flask(__name__)
-CORS(app, supports_credentials=True)
+CORS(app, supports_credentials=True, expose_headers=["X-Next-Cursor", "X-DB-Queries", "X-DB-Time-Ms", "X-DB-Slowest-Ms"])
 
 app.config.from_object(Configuration)
 db = SQLAlchemy(app)
@@ -15,6 +15,11 @@ import routes.user
 import routes.product
 import routes.organization
 import routes.content
+import routes.job
+import routes.metrics
+import routes.health
+import routes.trends
+import routes.scrape
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,29 @@
+"""Shared setup of the benchmarks, which run the app offline and against SQLite by default."""
+import os
+import uuid
+import atexit
+import shutil
+import sqlite3
+import tempfile
+
+def configure_environment(database_url):
+    """Point the app at `database_url` and the stub services. Must run before the app is imported."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SERVICE_PROVIDER", "stub")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("SESSION_TYPE", "filesystem")
+    if "SESSION_FILE_DIR" not in os.environ:
+        # Keep the session files of the benchmarks out of the server tree
+        os.environ["SESSION_FILE_DIR"] = tempfile.mkdtemp(prefix="benchmark-sessions-")
+        atexit.register(shutil.rmtree, os.environ["SESSION_FILE_DIR"], ignore_errors=True)
+    os.environ.setdefault("AZURE_STORAGE_ACCOUNT_NAME", "benchmark")
+    os.environ.setdefault("AZURE_CONTAINER_NAME", "images")
+
+def prepare_sqlite(engine):
+    """Store the UNIQUEIDENTIFIER columns as text, since SQLite has no native UUID type."""
+    from sqlalchemy.ext.compiler import compiles
+    from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+
+    compiles(UNIQUEIDENTIFIER, "sqlite")(lambda type_, compiler, **kw: "CHAR(36)")
+    sqlite3.register_adapter(uuid.UUID, str)
+    engine.dialect.supports_native_uuid = True
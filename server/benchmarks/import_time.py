@@ -0,0 +1,71 @@
+"""
+Measure the cost of importing the Flask application.
+
+Each run imports `app` in a fresh interpreter, so the numbers include every
+module pulled in by the routes. Run it on two checkouts to compare the
+import cost before and after a change:
+
+    python benchmarks/import_time.py --runs 5
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+HEAVY_MODULES = [
+    "langchain",
+    "langchain_openai",
+    "langchain_community",
+    "langgraph",
+    "openai",
+    "azure.ai.contentsafety",
+]
+
+PROBE = """
+import sys, json, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+def run_once():
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+    seconds = [sample["seconds"] for sample in samples]
+    results = {
+        "runs": args.runs,
+        "min_ms": round(min(seconds) * 1000, 1),
+        "median_ms": round(statistics.median(seconds) * 1000, 1),
+        "max_ms": round(max(seconds) * 1000, 1),
+        "heavy_modules_loaded": samples[-1]["loaded"],
+    }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Load test the hot API endpoints end to end.
+
+The app is driven in-process with one test client (and one logged-in user) per
+worker thread. It runs against a fresh SQLite database, or the database in
+--database-url, and every external service is replaced by its stub
+(SERVICE_PROVIDER=stub). For every endpoint the latency percentiles,
+throughput and SQL queries per request are reported. Endpoints that queue a
+job (content_create) are polled until the job finishes, and the end-to-end
+latency and failed jobs are reported separately from the enqueue request:
+
+    python benchmarks/load_test.py --requests 500 --concurrency 8 --output baseline.json
+
+Pass --compare to exit with an error when an endpoint regressed against an
+earlier run:
+
+    python benchmarks/load_test.py --compare baseline.json --tolerance 0.2
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import argparse
+import platform
+import tempfile
+import itertools
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from environment import configure_environment, prepare_sqlite
+from workflow_smoke import check_workflows
+
+CONTENT_LIST_FIELDS = "title,channel,type,status,likes,shares,clicks,impressions,created_at"
+ENDPOINTS = ["login", "profile", "contents", "products", "content_update", "content_create"]
+JOB_ENDPOINTS = {"content_create"}
+JOB_POLL_INTERVAL = 0.05
+PASSWORD = "benchmark-password"
+
+_local = threading.local()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                        help="Database to run against (defaults to a new SQLite file)")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument("--products", type=int, default=500, help="Products to seed")
+    parser.add_argument("--contents", type=int, default=2000, help="Contents to seed")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--job-timeout", type=float, default=120, help="Seconds to wait for a queued job to finish")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Fail if the results regressed against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression for --compare")
+    return parser.parse_args()
+
+def count_queries(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        _local.queries = getattr(_local, "queries", 0) + 1
+
+def seed(args):
+    """Create an organization with one user per client and the products and contents to query."""
+    from app import db
+    from routes.user import bcrypt
+    from models.organization import Organization
+    from models.user import User
+    from models.product import Product
+    from models.content import Content
+
+    db.create_all()
+    run = uuid.uuid4().hex[:8]
+    organization = Organization(id=str(uuid.uuid4()), name=f"Benchmark {run}")
+    password = bcrypt.generate_password_hash(PASSWORD).decode("utf-8")
+    users = [User(
+        id=str(uuid.uuid4()),
+        email=f"benchmark-{run}-{index}@example.com",
+        password=password,
+        first_name="Benchmark",
+        last_name=str(index),
+        organization_id=organization.id
+    ) for index in range(args.concurrency)]
+    products = [Product(
+        id=str(uuid.uuid4()),
+        name=f"Product {index:05d}",
+        price=10 + index % 90,
+        category=["Books", "Skincare", "Fashion"][index % 3],
+        description="A product seeded for the load test.",
+        organization_id=organization.id
+    ) for index in range(args.products)]
+    contents = [Content(
+        id=str(uuid.uuid4()),
+        title=f"Content {index:05d}",
+        channel=["Instagram", "TikTok", "Facebook"][index % 3],
+        type="Post",
+        status="Draft",
+        text="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+        media=[],
+        tags=["#benchmark"],
+        recommendations=[],
+        organization_id=organization.id,
+        product_id=products[index % len(products)].id if products else None
+    ) for index in range(args.contents)]
+
+    db.session.add(organization)
+    db.session.add_all(users + products + contents)
+    db.session.commit()
+    return {
+        "emails": [user.email for user in users],
+        "content_ids": [content.id for content in contents],
+        "product_ids": [product.id for product in products],
+    }
+
+REQUESTS = {
+    "login": lambda client, context, index: client.post("/login", json={"email": context["email"], "password": PASSWORD}),
+    "profile": lambda client, context, index: client.get("/profile"),
+    "contents": lambda client, context, index: client.get("/contents", query_string={"fields": CONTENT_LIST_FIELDS, "limit": 50}),
+    "products": lambda client, context, index: client.get("/products", query_string={"limit": 50}),
+    "content_update": lambda client, context, index: client.put(
+        f"/content/{context['content_ids'][index % len(context['content_ids'])]}",
+        data={"status": "Draft", "likes": str(index)}
+    ),
+    "content_create": lambda client, context, index: client.post("/content/create", data={
+        "title": f"Load test {index}",
+        "channel": "Instagram",
+        "type": "Post",
+        "objective": "Drive engagement",
+        "audience": "Young professionals",
+        "productId": context["product_ids"][index % len(context["product_ids"])] if context["product_ids"] else "",
+        "mode": "full"
+    }),
+}
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+def wait_for_job(client, job_id, timeout):
+    """Poll /job/<id> until the job completed or failed. Returns its final status, or "timed_out"."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        status = client.get(f"/job/{job_id}").get_json().get("status")
+        if status in ("completed", "failed"):
+            return status
+        time.sleep(JOB_POLL_INTERVAL)
+    return "timed_out"
+
+def latency_summary(latencies):
+    if not latencies:
+        return None
+    return {
+        "p50": round(percentile(latencies, 50), 2),
+        "p95": round(percentile(latencies, 95), 2),
+        "p99": round(percentile(latencies, 99), 2),
+        "mean": round(sum(latencies) / len(latencies), 2),
+        "max": round(max(latencies), 2),
+    }
+
+def run_endpoint(name, clients, requests, record=True, job_timeout=120):
+    counter = itertools.count()
+    latencies, queries, status_codes = [], [], {}
+    job_latencies, job_statuses = [], {}
+    lock = threading.Lock()
+
+    def worker(item):
+        client, context = item
+        while (index := next(counter)) < requests:
+            _local.queries = 0
+            start = time.perf_counter()
+            response = REQUESTS[name](client, context, index)
+            elapsed = time.perf_counter() - start
+            request_queries = _local.queries
+            with lock:
+                latencies.append(elapsed * 1000)
+                queries.append(request_queries)
+                status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+
+            # Wait for the queued job, so a job that fails in the background is not counted as a success
+            if name in JOB_ENDPOINTS and response.status_code == 202:
+                job_status = wait_for_job(client, response.get_json()["id"], job_timeout)
+                job_elapsed = time.perf_counter() - start
+                with lock:
+                    job_statuses[job_status] = job_statuses.get(job_status, 0) + 1
+                    if job_status == "completed":
+                        job_latencies.append(job_elapsed * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        list(executor.map(worker, clients))
+    wall = time.perf_counter() - start
+    if not record:
+        return None
+
+    result = {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in status_codes.items() if status >= 400),
+        "rejected": status_codes.get(503, 0),
+        "status_codes": {str(status): count for status, count in sorted(status_codes.items())},
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "latency_ms": latency_summary(latencies),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+    }
+    if name in JOB_ENDPOINTS:
+        result["jobs"] = {
+            "completed": job_statuses.get("completed", 0),
+            "failed": job_statuses.get("failed", 0),
+            "timed_out": job_statuses.get("timed_out", 0),
+            "latency_ms": latency_summary(job_latencies),
+        }
+    return result
+
+def compare(results, baseline, tolerance):
+    """List the metrics of `results` that regressed by more than `tolerance` against `baseline`."""
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p50", "p95", "p99"):
+            if current["latency_ms"][metric] > previous["latency_ms"][metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous['latency_ms'][metric]} ms -> {current['latency_ms'][metric]} ms")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} requests/s")
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            regressions.append(f"{name}: queries per request {previous['queries_per_request']} -> {current['queries_per_request']}")
+
+        jobs, previous_jobs = current.get("jobs"), previous.get("jobs")
+        if not jobs or not previous_jobs:
+            continue
+        for metric in ("p50", "p95", "p99"):
+            if jobs["latency_ms"] and previous_jobs["latency_ms"] and jobs["latency_ms"][metric] > previous_jobs["latency_ms"][metric] * (1 + tolerance):
+                regressions.append(f"{name}: job {metric} {previous_jobs['latency_ms'][metric]} ms -> {jobs['latency_ms'][metric]} ms")
+        unfinished = jobs["failed"] + jobs["timed_out"]
+        if unfinished > previous_jobs["failed"] + previous_jobs["timed_out"]:
+            regressions.append(f"{name}: failed jobs {previous_jobs['failed'] + previous_jobs['timed_out']} -> {unfinished}")
+    return regressions
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        args.database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='socialite-'), 'benchmark.db')}?timeout=30"
+    configure_environment(args.database_url)
+
+    from app import app, db
+    from services import jobs
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            prepare_sqlite(db.engine)
+        count_queries(db.engine)
+        seeded = seed(args)
+        if JOB_ENDPOINTS & set(args.endpoints):
+            # Injected stub errors fail some jobs on purpose, so this only warns
+            for problem in check_workflows():
+                print(f"WARNING the content workflow fails in {problem}")
+
+    clients = []
+    for email in seeded["emails"]:
+        client = app.test_client()
+        client.post("/login", json={"email": email, "password": PASSWORD})
+        clients.append((client, {**seeded, "email": email}))
+
+    results = {
+        "created_at": datetime.utcnow().isoformat(),
+        "config": {
+            "database": args.database_url.split(":", 1)[0],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "products": args.products,
+            "contents": args.contents,
+            "python": platform.python_version(),
+        },
+        "endpoints": {},
+    }
+    for name in args.endpoints:
+        run_endpoint(name, clients, args.warmup, record=False, job_timeout=args.job_timeout)
+        results["endpoints"][name] = run_endpoint(name, clients, args.requests, job_timeout=args.job_timeout)
+        print(f"{name}: {json.dumps(results['endpoints'][name])}")
+
+    # Let the queued content jobs finish before the database goes away
+    jobs._executor.shutdown(wait=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
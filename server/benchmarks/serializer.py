@@ -0,0 +1,81 @@
+"""
+Compare SerializerMixin.to_dict() with the precompiled ModelSerializer.
+
+Rows are generated in memory, so no database connection is needed:
+
+    python benchmarks/serializer.py --rows 10000
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app
+from models.content import Content
+from serializers import content_serializer
+
+def make_values(index):
+    return {
+        "id": uuid.uuid4(),
+        "title": f"Content {index}",
+        "channel": "Instagram",
+        "type": "Post",
+        "objective": "Drive engagement for the spring collection",
+        "audience": "Young professionals",
+        "status": "Draft",
+        "link": None,
+        "text": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+        "media": [f"https://example.blob.core.windows.net/images/content/{index}.png"],
+        "tags": ["#spring", "#fashion", "#sale"],
+        "score": 8,
+        "analysis": "The content is well aligned with the objective. " * 4,
+        "recommendations": ["Add a call to action", "Shorten the caption"],
+        "likes": index,
+        "shares": index // 2,
+        "clicks": index // 3,
+        "impressions": index * 10,
+        "scheduled_at": None,
+        "published_at": None,
+        "created_at": datetime(2025, 3, 28, 12, 0, 0),
+        "updated_at": datetime(2025, 3, 28, 12, 0, 0),
+        "organization_id": uuid.uuid4(),
+        "product_id": None,
+    }
+
+def measure(function, rows):
+    start = time.perf_counter()
+    function(rows)
+    elapsed = time.perf_counter() - start
+    return round(len(rows) / elapsed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    values = [make_values(index) for index in range(args.rows)]
+    fields = content_serializer.fields
+    with app.app_context():
+        models = [Content(**value) for value in values]
+        tuples = [tuple(value[field] for field in fields) for value in values]
+
+        results = {
+            "rows": args.rows,
+            "to_dict_rows_per_sec": measure(lambda rows: [row.to_dict() for row in rows], models),
+            "serializer_dicts_rows_per_sec": measure(lambda rows: content_serializer.to_dicts(rows, fields), tuples),
+            "serializer_json_rows_per_sec": measure(lambda rows: content_serializer.to_json(rows, fields), tuples),
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
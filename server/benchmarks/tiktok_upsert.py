@@ -0,0 +1,82 @@
+"""
+Measure the bulk upsert throughput of save_tiktok_data_to_db.
+
+Every size is written twice: once into an empty table (inserts) and once
+more with new counters (updates). SQLite in memory is used by default;
+pass --url to run against another database:
+
+    python benchmarks/tiktok_upsert.py --sizes 10000 100000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+from environment import configure_environment, prepare_sqlite
+
+# Importing the app sets up its own database and service clients, which the benchmark does not use
+configure_environment(os.getenv("DATABASE_URL", "sqlite://"))
+
+from app import app
+from models.tiktok import TikTokScrape
+from services.scrapers.tiktok import upsert_tiktok_rows, _to_row
+
+def make_items(size, seed):
+    return [{
+        "id": f"7{index:018d}",
+        "main_text": f"Video {index} #booktok #reading",
+        "hashtags": ["#booktok", "#reading"],
+        "user_id": f"creator{index % 500}",
+        "upload_date": "2025-03-28",
+        "video_link": f"https://www.tiktok.com/@creator{index % 500}/video/7{index:018d}",
+        "likes_count": index + seed,
+        "comments_count": (index + seed) // 10,
+        "views_count": (index + seed) * 20,
+        "bookmark_count": (index + seed) // 5,
+        "shares_count": (index + seed) // 7,
+        "Search Term": "Books"
+    } for index in range(size)]
+
+def measure(engine, items):
+    scraped_at = datetime.utcnow()
+    rows = [_to_row(item, scraped_at) for item in items]
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        upsert_tiktok_rows(connection, rows)
+    return round(len(rows) / (time.perf_counter() - start))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    options = {"fast_executemany": True} if args.url.startswith("mssql") else {}
+    engine = create_engine(args.url, **options)
+    if engine.dialect.name == "sqlite":
+        prepare_sqlite(engine)
+
+    results = []
+    for size in args.sizes:
+        TikTokScrape.__table__.drop(engine, checkfirst=True)
+        TikTokScrape.__table__.create(engine)
+        results.append({
+            "rows": size,
+            "insert_rows_per_sec": measure(engine, make_items(size, 0)),
+            "update_rows_per_sec": measure(engine, make_items(size, 1)),
+        })
+    TikTokScrape.__table__.drop(engine, checkfirst=True)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Smoke check the content workflow offline: run the whole graph in every mode
+against the stub services and fail if a mode raises or leaves an output empty.
+
+    python benchmarks/workflow_smoke.py
+
+The nodes print their errors instead of raising, so the outputs of every mode
+are checked as well. The STUB_* latency and error settings apply as usual.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from environment import configure_environment
+
+# Outputs every mode must fill, besides the evaluation
+MODE_OUTPUTS = {
+    "full": ["generated_text", "generated_tags", "generated_media"],
+    "text_only": ["generated_text", "generated_tags"],
+    "media_only": ["generated_media"],
+    "": [],
+}
+EVALUATION_OUTPUTS = ["generated_score", "generated_analysis", "generated_recommendations"]
+
+def check_workflows(modes=None):
+    """Run the workflow in every mode and return a list of problems. Must be called inside an application context."""
+    from services.content import run_workflow, ContentState
+
+    problems = []
+    for mode in modes or MODE_OUTPUTS:
+        state = ContentState(
+            title="Smoke test",
+            channel="Instagram",
+            type="Post",
+            objective="Drive engagement",
+            audience="Young professionals",
+            product={"name": "Notebook", "description": "A dotted notebook.", "category": "Books"},
+            text="An existing caption to evaluate.",
+            number_of_images=2
+        )
+        try:
+            final_state = run_workflow(state, mode)
+        except Exception as e:
+            problems.append(f"mode {mode!r}: {type(e).__name__}: {e}")
+            continue
+
+        for output in MODE_OUTPUTS[mode] + EVALUATION_OUTPUTS:
+            if not getattr(final_state, output):
+                problems.append(f"mode {mode!r}: {output} is empty")
+        if "generated_media" in MODE_OUTPUTS[mode] and len(final_state.generated_media) != state.number_of_images:
+            problems.append(f"mode {mode!r}: {len(final_state.generated_media)} of {state.number_of_images} images generated")
+        if "evaluate_content" not in final_state.telemetry:
+            problems.append(f"mode {mode!r}: no telemetry was recorded")
+    return problems
+
+def main():
+    configure_environment(os.getenv("DATABASE_URL", "sqlite://"))
+    os.environ["SERVICE_PROVIDER"] = "stub"
+
+    from app import app, db
+    from environment import prepare_sqlite
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            prepare_sqlite(db.engine)
+            db.create_all()
+        problems = check_workflows()
+
+    for problem in problems:
+        print(f"FAILED {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"The content workflow ran in {len(MODE_OUTPUTS)} modes.")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import os
 import urllib.parse
 from dotenv import load_dotenv
-from azure.storage.blob import BlobServiceClient
 
 load_dotenv()
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -14,6 +13,7 @@ class Configuration(object):
     SESSION_TYPE = os.getenv('SESSION_TYPE')
     SESSION_PERMANENT = os.getenv('SESSION_PERMANENT')
     SESSION_USE_SIGNER = os.getenv('SESSION_USE_SIGNER')
+    SESSION_FILE_DIR = os.getenv('SESSION_FILE_DIR', os.path.join(os.getcwd(), 'flask_session'))
 
     server = os.getenv("DB_SERVER")
     database = os.getenv("DB_NAME")
@@ -34,21 +34,15 @@ class Configuration(object):
         f"TrustServerCertificate={trust_cert};"
         f"Connection Timeout={timeout};"
     )
-    SQLALCHEMY_DATABASE_URI = f"mssql+pyodbc:///?odbc_connect={params}"
-
-    from sqlalchemy import create_engine
-
-    try:
-        engine = create_engine(SQLALCHEMY_DATABASE_URI)
-        conn = engine.connect()
-        print("Connected successfully to Azure SQL...")
-        conn.close()
-    except Exception as e:
-        print("ERROR: Connection to Azure SQL failed...", e)
-
-
-
-
-    
-
-    
\ No newline at end of file
+    # DATABASE_URL overrides the Azure SQL connection, e.g. sqlite:///socialite.db for benchmarks
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL") or f"mssql+pyodbc:///?odbc_connect={params}"
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "True").lower() == "true",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+    }
+    if not SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
+        SQLALCHEMY_ENGINE_OPTIONS["pool_size"] = int(os.getenv("DB_POOL_SIZE", 5))
+        SQLALCHEMY_ENGINE_OPTIONS["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    if SQLALCHEMY_DATABASE_URI.startswith("mssql"):
+        SQLALCHEMY_ENGINE_OPTIONS["fast_executemany"] = True
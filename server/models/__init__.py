@@ -1,4 +1,10 @@
 from models.user import User
 from models.organization import Organization
 from models.content import Content
-from models.product import Product
\ No newline at end of file
+from models.product import Product
+from models.job import Job
+from models.research import ResearchCache
+from models.blob import BlobTombstone
+from models.tiktok import TikTokScrape, TikTokSnapshot, TikTokTrend
+from models.scrape import ScrapeRun, ScrapeRunTerm, ScrapeTerm
+from models.workflow import WorkflowNodeRun
\ No newline at end of file
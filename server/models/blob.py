@@ -0,0 +1,18 @@
+from app import db
+from uuid import uuid4
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+
+class BlobTombstone(db.Model, SerializerMixin):
+    __tablename__ = 'blob_tombstone'
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    url = db.Column(db.String(1000), nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, default=db.func.current_timestamp(), index=True)
+
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<BlobTombstone {self.url}>'
@@ -5,6 +5,13 @@ from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER, JSON
 
 class Content(db.Model, SerializerMixin):
     __tablename__ = 'content'
+    __table_args__ = (
+        db.Index('ix_content_organization_id_created_at', 'organization_id', 'created_at', 'id'),
+        db.Index('ix_content_organization_id_status', 'organization_id', 'status', 'created_at'),
+        db.Index('ix_content_organization_id_channel', 'organization_id', 'channel', 'created_at'),
+        db.Index('ix_content_organization_id_type', 'organization_id', 'type', 'created_at'),
+        db.Index('ix_content_organization_id_product_id', 'organization_id', 'product_id', 'created_at'),
+    )
 
     id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
     title = db.Column(db.String(500), nullable=False)
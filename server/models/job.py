@@ -0,0 +1,29 @@
+from app import db
+from uuid import uuid4
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER, JSON
+
+class Job(db.Model, SerializerMixin):
+    __tablename__ = 'job'
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    type = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(50), nullable=False, default='queued')
+    payload = db.Column(JSON, nullable=True, default=dict)
+    error = db.Column(db.Text, nullable=True)
+    result = db.Column(JSON, nullable=True)
+    worker = db.Column(db.String(100), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+
+    content_id = db.Column(UNIQUEIDENTIFIER, nullable=True)
+
+    organization_id = db.Column(UNIQUEIDENTIFIER, db.ForeignKey('organization.id'), nullable=False)
+
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    serialize_rules = ('-payload', '-worker', '-heartbeat_at')
+
+    def __repr__(self):
+        return f'<Job {self.type} {self.status}>'
@@ -5,6 +5,11 @@ from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER, JSON
 
 class Product(db.Model, SerializerMixin):
     __tablename__ = 'product'
+    __table_args__ = (
+        db.Index('ix_product_organization_id_name', 'organization_id', 'name', 'id'),
+        db.Index('ix_product_organization_id_category', 'organization_id', 'category', 'name'),
+        db.Index('ix_product_organization_id_price', 'organization_id', 'price'),
+    )
 
     id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
     name = db.Column(db.String(500), nullable=False)
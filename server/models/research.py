@@ -0,0 +1,14 @@
+from app import db
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.mssql import JSON
+
+class ResearchCache(db.Model, SerializerMixin):
+    __tablename__ = 'research_cache'
+
+    key = db.Column(db.String(64), primary_key=True)
+    research = db.Column(JSON, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<ResearchCache {self.key}>'
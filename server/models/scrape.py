@@ -0,0 +1,68 @@
+from app import db
+from uuid import uuid4
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER, JSON
+
+class ScrapeRun(db.Model, SerializerMixin):
+    __tablename__ = 'scrape_run'
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    status = db.Column(db.String(50), nullable=False, default='running')
+    max_entries_pterm = db.Column(db.Integer, nullable=False, default=6)
+    error = db.Column(db.Text, nullable=True)
+
+    started_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    terms = db.relationship('ScrapeRunTerm', back_populates='run', lazy='selectin', cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<ScrapeRun {self.id} {self.status}>'
+
+class ScrapeRunTerm(db.Model, SerializerMixin):
+    __tablename__ = 'scrape_run_term'
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    search_term = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(50), nullable=False, default='pending')
+    videos = db.Column(JSON, nullable=True)
+    scraped = db.Column(JSON, nullable=False, default=list)
+
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    run_id = db.Column(UNIQUEIDENTIFIER, db.ForeignKey('scrape_run.id'), nullable=False, index=True)
+    run = db.relationship('ScrapeRun', back_populates='terms')
+
+    serialize_rules = ('-run', '-videos')
+
+    def __repr__(self):
+        return f'<ScrapeRunTerm {self.search_term} {self.status}>'
+
+class ScrapeTerm(db.Model, SerializerMixin):
+    __tablename__ = 'scrape_term'
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    search_term = db.Column(db.String(100), nullable=False, unique=True)
+    refresh_interval = db.Column(db.Integer, nullable=False, default=1440)  # minutes
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    max_entries_pterm = db.Column(db.Integer, nullable=False, default=6)
+    active = db.Column(db.Boolean, nullable=False, default=True)
+
+    last_status = db.Column(db.String(50), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    last_result_hash = db.Column(db.String(64), nullable=True)
+    last_run_at = db.Column(db.DateTime, nullable=True)
+    last_scraped_at = db.Column(db.DateTime, nullable=True)
+    next_run_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_scrape_term_active_next_run_at', 'active', 'next_run_at'),
+    )
+
+    serialize_rules = ('-last_result_hash',)
+
+    def __repr__(self):
+        return f'<ScrapeTerm {self.search_term}>'
@@ -0,0 +1,70 @@
+from app import db
+from uuid import uuid4
+from datetime import datetime
+from sqlalchemy_serializer import SerializerMixin
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+
+class TikTokScrape(db.Model, SerializerMixin):
+    __tablename__ = "TikTokScrape"
+
+    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
+    video_id = db.Column(db.String(100), nullable=False, unique=True)
+    search_term = db.Column(db.String(100), nullable=False)
+    username = db.Column(db.String(100), nullable=False)
+    profile_link = db.Column(db.String(500), nullable=False)
+    avatar_url = db.Column(db.String(500), nullable=True)
+    main_text = db.Column(db.Text, nullable=False)
+    video_link = db.Column(db.String(500), nullable=False)
+    upload_date = db.Column(db.DateTime, default=None)
+    likes_count = db.Column(db.Integer, default=0)
+    comments_count = db.Column(db.Integer, default=0)
+    shares_count = db.Column(db.Integer, default=0)
+    views_count = db.Column(db.Integer, default=0)
+    hashtags = db.Column(db.Text, nullable=True)
+    bookmark_count = db.Column(db.Integer, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    serialize_rules = ('-created_at', '-updated_at')
+
+    def __repr__(self):
+        return f'<TikTokScrape {self.video_id}>'
+
+class TikTokSnapshot(db.Model):
+    __tablename__ = "TikTokSnapshot"
+    __table_args__ = (
+        db.Index('ix_TikTokSnapshot_video_id_scraped_at', 'video_id', 'scraped_at'),
+        db.Index('ix_TikTokSnapshot_search_term_scraped_at', 'search_term', 'scraped_at'),
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    video_id = db.Column(db.String(100), nullable=False)
+    search_term = db.Column(db.String(100), nullable=False)
+    scraped_at = db.Column(db.DateTime, nullable=False, index=True)
+    likes_count = db.Column(db.Integer, default=0)
+    comments_count = db.Column(db.Integer, default=0)
+    shares_count = db.Column(db.Integer, default=0)
+    views_count = db.Column(db.Integer, default=0)
+    bookmark_count = db.Column(db.Integer, default=0)
+
+    def __repr__(self):
+        return f'<TikTokSnapshot {self.video_id} {self.scraped_at}>'
+
+class TikTokTrend(db.Model):
+    __tablename__ = "TikTokTrend"
+    __table_args__ = (
+        db.Index('ix_TikTokTrend_search_term_rank', 'search_term', 'rank'),
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    search_term = db.Column(db.String(100), nullable=False)
+    hashtag = db.Column(db.String(200), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    videos = db.Column(db.Integer, default=0)
+    views_per_hour = db.Column(db.Float, default=0)
+    engagement_per_hour = db.Column(db.Float, default=0)
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<TikTokTrend {self.search_term} #{self.rank} {self.hashtag}>'
@@ -0,0 +1,23 @@
+from app import db
+from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+
+class WorkflowNodeRun(db.Model):
+    __tablename__ = 'workflow_node_run'
+    __table_args__ = (
+        db.Index('ix_workflow_node_run_created_at', 'created_at'),
+        db.Index('ix_workflow_node_run_organization_id_created_at', 'organization_id', 'created_at'),
+    )
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True, autoincrement=True)
+    organization_id = db.Column(UNIQUEIDENTIFIER, db.ForeignKey('organization.id'), nullable=False)
+    mode = db.Column(db.String(20), nullable=False)
+    node = db.Column(db.String(50), nullable=False)
+    ms = db.Column(db.Integer, nullable=False, default=0)
+    retries = db.Column(db.SmallInteger, nullable=False, default=0)
+    prompt_tokens = db.Column(db.Integer, nullable=False, default=0)
+    completion_tokens = db.Column(db.Integer, nullable=False, default=0)
+    images = db.Column(db.SmallInteger, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    def __repr__(self):
+        return f'<WorkflowNodeRun {self.mode} {self.node} {self.ms} ms>'
@@ -1,92 +1,325 @@
-import io
+import os
+import json
+from uuid import UUID
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pydantic import ValidationError
 from app import app, db
-from flask import request, jsonify
-from urllib.request import urlopen
+from flask import request, jsonify, Response, stream_with_context
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import SQLAlchemyError
 
 from models.content import Content
 from models.product import Product
-from services.content import init_workflow, ContentState
-from utils import auth_required, upload_image_to_azure, delete_image_from_azure
+from services.content import init_workflow, run_workflow, stream_workflow, conduct_market_research, research_cache_key, ContentState, WORKFLOW_MODES
+from services.jobs import submit_job, acquire_job_slot, release_job_slot, JobQueueFull
+from services.telemetry import record_workflow_telemetry, build_node_runs
+from services.blobs import queue_blob_deletion, purge_blobs_in_background, discard_uploaded_media
+from utils import auth_required, upload_images_to_azure, transfer_images_to_azure, get_page_size, get_fields, encode_cursor, decode_cursor
+from serializers import content_serializer
+
+BULK_CONTENT_LIMIT = int(os.getenv("BULK_CONTENT_LIMIT", 50))
+BULK_CONTENT_WORKERS = int(os.getenv("BULK_CONTENT_WORKERS", 4))
+
+def get_product_data(product_id):
+    if not product_id:
+        return None
+    product = Product.query.filter_by(id=product_id).first()
+    if not product:
+        return None
+    data = {"name": product.name, "description": product.description}
+    if product.category:
+        data["category"] = product.category
+    return data
+
+def get_content_state(fields, generation):
+    return ContentState(
+        title=fields['title'],
+        channel=fields['channel'],
+        type=fields['type'],
+        objective=fields['objective'],
+        audience=fields['audience'],
+        product=get_product_data(fields['product_id']),
+        **generation)
+
+def create_content_task(fields, generation, mode):
+    """Run the content workflow and insert the resulting Content row."""
+    final_state = run_workflow(get_content_state(fields, generation), mode)
+    return save_created_content(fields, final_state, mode).id
+
+def build_created_content(fields, final_state, generated_media):
+    new_content = Content(
+        **fields,
+        text=final_state.generated_text,
+        tags=final_state.generated_tags,
+        score=final_state.generated_score,
+        analysis=final_state.generated_analysis,
+        recommendations=final_state.generated_recommendations
+    )
+    new_content.media = new_content.media + generated_media
+    return new_content
+
+def save_created_content(fields, final_state, mode):
+    new_content = build_created_content(fields, final_state, transfer_images_to_azure(final_state.generated_media, "content"))
+
+    db.session.add(new_content)
+    record_workflow_telemetry(fields['organization_id'], mode, final_state.telemetry)
+    db.session.commit()
+    return new_content
+
+def bulk_content_task(items):
+    """
+    Generate a batch of content items and insert every successful one in a single
+    transaction. Products are loaded and market research is run once per distinct
+    product, channel, type, objective and audience; the workflows then run on
+    BULK_CONTENT_WORKERS threads. Returns a report with the outcome of every item.
+    """
+    results = [{"index": index, "title": item["fields"]["title"]} for index, item in enumerate(items)]
+
+    products = {product_id: get_product_data(product_id) for product_id in {item["fields"]["product_id"] for item in items} if product_id}
+    states = {}
+    for index, item in enumerate(items):
+        fields = item["fields"]
+        try:
+            states[index] = ContentState(
+                title=fields['title'],
+                channel=fields['channel'],
+                type=fields['type'],
+                objective=fields['objective'],
+                audience=fields['audience'],
+                product=products.get(fields['product_id']),
+                **item["generation"])
+        except ValidationError as e:
+            results[index]["error"] = str(e)
+
+    groups = {}
+    for index, state in states.items():
+        if items[index]["mode"]:
+            groups.setdefault(research_cache_key(state), []).append(index)
+
+    def research(indexes):
+        with app.app_context():
+            return conduct_market_research(states[indexes[0]]).market_research
+
+    def generate(index):
+        with app.app_context():
+            final_state = run_workflow(states[index], workflow=workflows[items[index]["mode"]])
+            return final_state, transfer_images_to_azure(final_state.generated_media, "content")
+
+    workflows = {mode: init_workflow(mode) for mode in {item["mode"] for item in items}}
+    with ThreadPoolExecutor(max_workers=BULK_CONTENT_WORKERS, thread_name_prefix="bulk-content") as executor:
+        researches = {executor.submit(research, indexes): indexes for indexes in groups.values()}
+        for future in as_completed(researches):
+            try:
+                market_research = future.result()
+            except Exception as e:
+                print(f"Bulk Market Research Error: {e}")
+                continue
+            for index in researches[future]:
+                states[index].market_research = market_research
+
+        generations = {executor.submit(generate, index): index for index in states}
+        created, node_runs = [], []
+        for future in as_completed(generations):
+            index = generations[future]
+            try:
+                final_state, generated_media = future.result()
+                created.append((index, build_created_content(items[index]["fields"], final_state, generated_media)))
+                node_runs.extend(build_node_runs(items[index]["fields"]["organization_id"], items[index]["mode"], final_state.telemetry))
+            except Exception as e:
+                print(f"Bulk Content Error: {e}")
+                results[index]["error"] = str(e)
+
+    try:
+        db.session.add_all([content for _, content in created] + node_runs)
+        db.session.commit()
+        for index, content in created:
+            results[index]["content_id"] = str(content.id)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        discard_uploaded_media([url for _, content in created for url in content.media])
+        for index, _ in created:
+            results[index]["error"] = str(e)
+
+    return {
+        "created": sum(1 for result in results if "content_id" in result),
+        "failed": sum(1 for result in results if "error" in result),
+        "items": results
+    }
+
+def regenerate_content_task(content_id, generation, mode):
+    """Run the content workflow against an existing Content row and persist the result."""
+    content = Content.query.filter_by(id=content_id).first()
+    if not content:
+        raise ValueError("Content could not be found.")
+
+    state = ContentState(
+        title=content.title, 
+        channel=content.channel, 
+        type=content.type, 
+        objective=content.objective, 
+        audience=content.audience, 
+        product=get_product_data(content.product_id),
+        text=content.text,
+        tags=content.tags,
+        **generation)
+
+    final_state = run_workflow(state, mode)
+
+    if mode=="text_only" or mode=="full":
+        content.text = final_state.generated_text
+        content.tags = final_state.generated_tags
+
+    content.score = final_state.generated_score
+    content.analysis = final_state.generated_analysis
+    content.recommendations = final_state.generated_recommendations
+
+    if mode=="media_only" or mode=="full":
+        content.media = content.media + transfer_images_to_azure(final_state.generated_media, "content")
+    record_workflow_telemetry(content.organization_id, mode, final_state.telemetry)
+    db.session.commit()
+    return content.id
+
+def get_generation_options(data):
+    return {
+        "instructions": data.get('instructions', None),
+        "style": data.get('style', None),
+        "dimensions": data.get('dimensions', None),
+        "key_elements": data.get('key_elements', None),
+        "number_of_images": data.get('number_of_images', 1)
+    }
+
+def get_content_fields(data, user, media):
+    return {
+        "title": data.get('title'),
+        "channel": data.get('channel'),
+        "type": data.get('type'),
+        "objective": data.get('objective', None),
+        "audience": data.get('audience', None),
+        "status": data.get('status', 'Draft'),
+        "scheduled_at": data.get('scheduled_at', None),
+        "link": data.get('link', None),
+        "media": media,
+        "organization_id": user.organization_id,
+        "product_id": data.get('productId', None)
+    }
+
+@app.route('/content/bulk', methods=['POST'])
+@auth_required
+def create_contents_bulk():
+    """
+    Queue the generation of several content items as one job. The body holds the
+    `items` to create, with the same fields as /content/create, and optional
+    `defaults` that apply to every item.
+    """
+    data = request.json or {}
+
+    user = request.user
+    if not user.organization_id:
+        return jsonify({"error": "User is not part of any organization."}), 403
+
+    defaults = data.get('defaults', {})
+    specs = [{**defaults, **spec} for spec in data.get('items', [])]
+    if not specs:
+        return jsonify({"error": "At least one item is required."}), 400
+    if len(specs) > BULK_CONTENT_LIMIT:
+        return jsonify({"error": f"At most {BULK_CONTENT_LIMIT} items can be created at once."}), 400
+    for index, spec in enumerate(specs):
+        missing = [field for field in ('title', 'channel', 'type') if not spec.get(field)]
+        if missing:
+            return jsonify({"error": f"Item {index} is missing {', '.join(missing)}."}), 400
+        if spec.get('mode', '') not in WORKFLOW_MODES:
+            return jsonify({"error": f"Item {index} has an invalid mode: {spec.get('mode')}."}), 400
+
+    items = [{
+        "fields": get_content_fields(spec, user, []),
+        "generation": get_generation_options(spec),
+        "mode": spec.get('mode', '')
+    } for spec in specs]
+
+    try:
+        job = submit_job('content_bulk', user.organization_id, bulk_content_task, items,
+                         payload={"items": len(items)})
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(job.to_dict()), 202
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 @app.route('/content/create', methods=['POST'])
 @auth_required
 def create_content():
     data = request.form
-    title = data.get('title')
-    channel = data.get('channel')
-    type = data.get('type')
-    objective = data.get('objective', None)
-    audience = data.get('audience', None)
-    status = data.get('status', 'Draft')
-    scheduled_at = data.get('scheduled_at', None)
-    link = data.get('link', None)
-
-    instructions = data.get('instructions', None)
-    style = data.get('style', None)
-    dimensions = data.get('dimensions', None)
-    key_elements = data.get('key_elements', None)
-    number_of_images = data.get('number_of_images', 1)
 
+    user = request.user
+    if not user.organization_id:
+        return jsonify({"error": "User is not part of any organization."}), 403
+
+    media_files = request.files.getlist('newMedia')
+    fields = get_content_fields(data, user, upload_images_to_azure(media_files, "contents"))
+    generation = get_generation_options(data)
     mode = data.get('mode', '')
 
-    product_id = data.get('productId', None)
-    if product_id:
-        product = Product.query.filter_by(id=product_id).first()
-        product_data = {"name": product.name, "description": product.description} if product else None
+    try:
+        job = submit_job('content_create', user.organization_id, create_content_task, fields, generation, mode,
+                         payload={"mode": mode, "title": fields['title'], "media": fields['media']})
+    except JobQueueFull as e:
+        discard_uploaded_media(fields['media'])
+        return jsonify({"error": str(e)}), 503
+    return jsonify(job.to_dict()), 202
+
+@app.route('/content/create/stream', methods=['POST'])
+@auth_required
+def create_content_stream():
+    """
+    Create content like /content/create, but stream the progress as Server-Sent Events:
+    `node` when a workflow node finishes, `token` for every fragment of the generated
+    text once it passed the safety check (`safety` with the replacement text when it
+    did not) and `content` with the saved row (or `error`) at the end. The uploaded
+    media is deleted again when the content is not saved.
+    """
+    data = request.form
 
     user = request.user
     if not user.organization_id:
         return jsonify({"error": "User is not part of any organization."}), 403
-    
-    state = ContentState(
-        title=title, 
-        channel=channel, 
-        type=type, 
-        objective=objective, 
-        audience=audience, 
-        product=product_data,
-        instructions=instructions,
-        style=style, 
-        dimensions=dimensions, 
-        key_elements=key_elements, 
-        number_of_images=number_of_images)
-    
-    workflow = init_workflow(mode)
-    final_state = workflow.invoke(state)
-    
+
+    try:
+        acquire_job_slot()
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+
     media_files = request.files.getlist('newMedia')
-    media = [upload_image_to_azure(img, "contents") for img in media_files if img]
-    generated_media_files = final_state.generated_media
-    for url in generated_media_files:
+    fields = get_content_fields(data, user, upload_images_to_azure(media_files, "contents"))
+    generation = get_generation_options(data)
+    mode = data.get('mode', '')
+
+    def generate():
+        saved = False
         try:
-            image_data = urlopen(url).read()
-            image_file = io.BytesIO(image_data)
-            media.append(upload_image_to_azure(image_file, "content", True))
+            yield format_event("start", {"mode": mode})
+            for event, payload in stream_workflow(get_content_state(fields, generation), mode):
+                if event == "state":
+                    content = save_created_content(fields, payload, mode)
+                    saved = True
+                    yield format_event("content", content.to_dict())
+                else:
+                    yield format_event(event, payload)
         except Exception as e:
-            print(f"ERROR: {e}")
+            db.session.rollback()
+            print(f"Content Stream Error: {e}")
+            yield format_event("error", {"error": str(e)})
+        finally:
+            # Also runs with GeneratorExit when the client disconnects mid-stream
+            if not saved:
+                db.session.rollback()
+                discard_uploaded_media(fields['media'])
 
-    new_content = Content(
-        title=title,
-        channel=channel,
-        type=type,
-        objective=objective,
-        audience=audience,
-        status=status,
-        link=link,
-        text=final_state.generated_text,
-        tags=final_state.generated_tags,
-        media=media,
-        score=final_state.generated_score,
-        analysis=final_state.generated_analysis,
-        recommendations=final_state.generated_recommendations,
-        scheduled_at=scheduled_at,
-        organization_id=user.organization_id,
-        product_id=product_id
-    )
-    
-    db.session.add(new_content)
-    db.session.commit()
-    return jsonify(new_content.to_dict()), 201
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(release_job_slot)
+    return response
 
 
 @app.route('/content/<id>', methods=['GET', 'PUT', 'DELETE'])
@@ -101,10 +334,10 @@ def content(id):
         return jsonify({"error": "User is not authorized to perform this action."}), 403
 
     if request.method == 'DELETE':
-        for med in content.media:
-            delete_image_from_azure(med)
+        tombstone_ids = queue_blob_deletion(content.media)
         db.session.delete(content)
         db.session.commit()
+        purge_blobs_in_background(tombstone_ids)
         return {"id": id}, 204
 
     elif request.method == 'PUT':
@@ -125,11 +358,7 @@ def content(id):
         content.impressions = data.get('impressions', content.impressions)
         content.scheduled_at = data.get('scheduled_at', content.scheduled_at)
         content.published_at = data.get('published_at', content.published_at)
-
         content.product_id = data.get('productId', content.product_id)
-        if content.product_id:
-            product = Product.query.filter_by(id=content.product_id).first()
-            product_data = {"name": product.name, "description": product.description} if product else None
 
         mode = data.get('mode')
 
@@ -146,70 +375,74 @@ def content(id):
         else:
             deleted_media = []
         content.media = [med for med in content.media if med not in deleted_media]
-        for med in deleted_media:
-            delete_image_from_azure(med)
+        tombstone_ids = queue_blob_deletion(deleted_media)
         db.session.commit()
+        purge_blobs_in_background(tombstone_ids)
 
         new_media = request.files.getlist('newMedia')
-        uploaded_media = [upload_image_to_azure(med, "content") for med in new_media if med]
+        uploaded_media = upload_images_to_azure(new_media, "content")
         content.media = content.media + uploaded_media
         db.session.commit()
 
         if mode:
-            instructions = data.get('instructions', None)
-            style = data.get('style', None)
-            dimensions = data.get('dimensions', None)
-            key_elements = data.get('key_elements', None)
-            number_of_images = data.get('number_of_images', 1)
-
-            state = ContentState(
-                title=content.title, 
-                channel=content.channel, 
-                type=content.type, 
-                objective=content.objective, 
-                audience=content.audience, 
-                product=product_data,
-                instructions=instructions,
-                style=style, 
-                dimensions=dimensions, 
-                key_elements=key_elements, 
-                number_of_images=number_of_images,
-                text=content.text,
-                tags=content.tags)
-        
-            workflow = init_workflow(mode)
-            final_state = workflow.invoke(state)
-
-            if mode=="text_only" or mode=="full":
-                content.text = final_state.generated_text
-                content.tags = final_state.generated_tags
-                db.session.commit()
-
-            content.score = final_state.generated_score
-            content.analysis = final_state.generated_analysis
-            content.recommendations = final_state.generated_recommendations
-
-            generated_media = []
-            if mode=="media_only" or mode=="full":
-                for url in final_state.generated_media:
-                    try:
-                        image_data = urlopen(url).read()
-                        image_file = io.BytesIO(image_data) 
-                        image_file.seek(0)
-                        generated_media.append(image_file)
-                    except Exception as e:
-                        print(f"ERROR: {e}")
-            uploaded_generated_media = [upload_image_to_azure(med, "content", True) for med in generated_media if med]
-            content.media = content.media + uploaded_generated_media
-            db.session.commit()
+            generation = get_generation_options(data)
+            try:
+                job = submit_job('content_regenerate', user.organization_id, regenerate_content_task, content.id, generation, mode,
+                                 payload={"mode": mode}, content_id=content.id)
+            except JobQueueFull as e:
+                return jsonify({"error": str(e)}), 503
+            return jsonify(job.to_dict()), 202
     return jsonify(content.to_dict()), 200
 
 @app.route('/contents', methods=['GET'])
 @auth_required
 def contents():
-    organization = request.user.organization
-    if not organization:
+    organization_id = request.user.organization_id
+    if not organization_id:
         return jsonify({"error": "User is not part of an organization."}), 403
 
-    contents = Content.query.filter_by(organization_id=organization.id).all()
-    return jsonify([content.to_dict() for content in contents]), 200
+    fields = get_fields(Content) or content_serializer.fields
+    columns = content_serializer.columns(fields)
+    if 'created_at' not in fields:
+        columns.append(Content.created_at)
+    query = db.session.query(*columns).filter(Content.organization_id == organization_id)
+
+    for field in ('status', 'channel', 'type'):
+        value = request.args.get(field)
+        if value:
+            query = query.filter(getattr(Content, field) == value)
+    product_id = request.args.get('productId')
+    if product_id:
+        query = query.filter(Content.product_id == product_id)
+
+    try:
+        created_from = request.args.get('from')
+        if created_from:
+            query = query.filter(Content.created_at >= datetime.fromisoformat(created_from))
+        created_to = request.args.get('to')
+        if created_to:
+            query = query.filter(Content.created_at <= datetime.fromisoformat(created_to))
+    except ValueError:
+        return jsonify({"error": "Invalid date range."}), 400
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+            cursor_created_at = datetime.fromisoformat(cursor_created_at)
+            UUID(cursor_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        query = query.filter(or_(
+            Content.created_at < cursor_created_at,
+            and_(Content.created_at == cursor_created_at, Content.id < cursor_id)
+        ))
+
+    limit = get_page_size()
+    rows = query.order_by(Content.created_at.desc(), Content.id.desc()).limit(limit + 1).all()
+
+    response = content_serializer.response(rows[:limit], fields)
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        response.headers['X-Next-Cursor'] = encode_cursor(last.created_at, last.id)
+    return response
\ No newline at end of file
@@ -0,0 +1,31 @@
+import click
+from app import app, db
+from flask import jsonify
+from sqlalchemy import text
+
+def check_database():
+    try:
+        db.session.execute(text("SELECT 1"))
+        return True, None
+    except Exception as e:
+        db.session.rollback()
+        return False, str(e)
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    healthy, error = check_database()
+    if not healthy:
+        # The driver error can contain the server and login details, so it is only logged
+        app.logger.error(f"Health Check Database Error: {error}")
+        return jsonify({"status": "unhealthy", "database": "database unavailable"}), 503
+    return jsonify({"status": "healthy", "database": "ok"}), 200
+
+@app.cli.command('check-db')
+def check_db():
+    """Open a connection to the configured database and report the result."""
+    healthy, error = check_database()
+    if healthy:
+        click.echo("Connected successfully to the database...")
+    else:
+        click.echo(f"ERROR: Connection to the database failed... {error}")
+        raise SystemExit(1)
@@ -0,0 +1,27 @@
+from app import app
+from flask import request, jsonify
+
+from models.job import Job
+from models.content import Content
+from utils import auth_required
+
+@app.route('/job/<id>', methods=['GET'])
+@auth_required
+def job(id):
+    job = Job.query.filter_by(id=id).first()
+    if not job:
+        return jsonify({"error": "Job could not be found."}), 404
+
+    user = request.user
+    if job.organization_id != user.organization_id:
+        return jsonify({"error": "User is not authorized to perform this action."}), 403
+
+    response = job.to_dict()
+    if job.status == 'completed' and job.content_id:
+        content = Content.query.filter_by(id=job.content_id).first()
+        response["content"] = content.to_dict() if content else None
+    elif job.status == 'completed' and job.result:
+        content_ids = [item["content_id"] for item in job.result.get("items", []) if item.get("content_id")]
+        contents = Content.query.filter(Content.id.in_(content_ids)).all() if content_ids else []
+        response["contents"] = [content.to_dict() for content in contents]
+    return jsonify(response), 200
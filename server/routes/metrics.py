@@ -0,0 +1,34 @@
+from app import app
+from flask import request, jsonify
+
+from services.cache import caches
+from services.query_stats import get_query_stats, reset_query_stats, SLOW_QUERY_MS
+from services.telemetry import get_workflow_telemetry
+from utils import admin_required
+
+@app.route('/metrics/cache', methods=['GET'])
+@admin_required
+def cache_metrics():
+    return jsonify({
+        name: cache.stats() for name, cache in caches.items()
+    }), 200
+
+@app.route('/metrics/queries', methods=['GET', 'DELETE'])
+@admin_required
+def query_metrics():
+    if request.method == 'DELETE':
+        reset_query_stats()
+        return {}, 204
+    return jsonify({
+        "slow_query_ms": SLOW_QUERY_MS,
+        "endpoints": get_query_stats()
+    }), 200
+
+@app.route('/metrics/workflow', methods=['GET'])
+@admin_required
+def workflow_metrics():
+    days = request.args.get('days', 7, type=int)
+    return jsonify({
+        "days": days,
+        "nodes": get_workflow_telemetry(days, request.args.get('organizationId'))
+    }), 200
@@ -3,7 +3,8 @@ from flask import request, jsonify
 
 from models.user import User
 from models.organization import Organization
-from utils import auth_required
+from utils import auth_required, get_current_user, invalidate_principal
+from serializers import organization_serializer
 
 @app.route('/organization/create', methods=['POST'])
 @auth_required
@@ -18,7 +19,7 @@ def create_organization():
             "error": "An organization with this name already exists."
         }), 409
     
-    user = request.user
+    user = get_current_user()
     if user.organization_id:
         return jsonify({"error": "The authenticated user is already a member of an organization."}), 400
     
@@ -28,6 +29,7 @@ def create_organization():
 
     user.organization_id = new_organization.id
     db.session.commit()
+    invalidate_principal(user.id)
 
     return jsonify({
         "id": new_organization.id,
@@ -46,10 +48,12 @@ def organization(id):
         }), 404
     if request.method == 'DELETE':
         organization_id = organization.id
-        for user in User.query.filter_by(organization_id=organization.id).all():
+        users = User.query.filter_by(organization_id=organization.id).all()
+        for user in users:
             user.organization_id = None
         db.session.delete(organization)
         db.session.commit()
+        invalidate_principal(*[user.id for user in users])
         return { "id" : organization_id }, 204
     elif request.method == 'PUT':
         data = request.json
@@ -91,6 +95,7 @@ def members(id):
                 return jsonify({"error": f"{user.email} is already a member of another organization."}), 400
             user.organization_id = organization.id
     db.session.commit()
+    invalidate_principal(*[user.id for user in users])
     return jsonify({
         "id": organization.id,
         "name": organization.name,
@@ -100,8 +105,6 @@ def members(id):
 
 @app.route('/organizations', methods=['GET'])
 def organizations():
-    organizations = Organization.query.all()
-    return jsonify([
-        organization.to_dict() for organization in organizations
-    ]), 200
+    organizations = db.session.query(*organization_serializer.columns()).all()
+    return organization_serializer.response(organizations)
 
@@ -1,8 +1,12 @@
 import json
+from uuid import UUID
 from app import app, db
 from flask import request, jsonify
+from sqlalchemy import and_, or_
 from models.product import Product
-from utils import auth_required, upload_image_to_azure, delete_image_from_azure
+from services.blobs import queue_blob_deletion, purge_blobs_in_background
+from utils import auth_required, upload_images_to_azure, get_page_size, get_fields, encode_cursor, decode_cursor
+from serializers import product_serializer
 
 @app.route('/product/create', methods=['POST'])
 @auth_required
@@ -20,7 +24,7 @@ def create_product():
         return jsonify({"error": "User is not part of any organization."}), 403
 
     image_files = request.files.getlist('newImages')
-    uploaded_images = [upload_image_to_azure(img, "products") for img in image_files if img]
+    uploaded_images = upload_images_to_azure(image_files, "products")
 
     new_product = Product(
         name=name,
@@ -50,10 +54,10 @@ def product(id):
         return jsonify({"error": "User is not authorized to perform this action."}), 403
 
     if request.method == 'DELETE':
-        for img in product.images:
-            delete_image_from_azure(img)
+        tombstone_ids = queue_blob_deletion(product.images)
         db.session.delete(product)
         db.session.commit()
+        purge_blobs_in_background(tombstone_ids)
         return {"id": id}, 204
 
     elif request.method == 'PUT':
@@ -78,13 +82,12 @@ def product(id):
         else:
             deleted_images = []
         product.images = [img for img in product.images if img not in deleted_images]
-        for img in deleted_images:
-            delete_image_from_azure(img)
-
+        tombstone_ids = queue_blob_deletion(deleted_images)
         db.session.commit()
+        purge_blobs_in_background(tombstone_ids)
 
         new_images = request.files.getlist('newImages')
-        uploaded_images = [upload_image_to_azure(img, "products") for img in new_images if img]
+        uploaded_images = upload_images_to_azure(new_images, "products")
         product.images.extend(uploaded_images)
 
         db.session.commit()
@@ -98,5 +101,49 @@ def products():
     if not user.organization_id:
         return jsonify({"error": "User is not part of any organization."}), 403
 
-    products = Product.query.filter_by(organization_id=user.organization_id).all()
-    return jsonify([product.to_dict() for product in products]), 200
+    fields = get_fields(Product) or product_serializer.fields
+    columns = product_serializer.columns(fields)
+    if 'name' not in fields:
+        columns.append(Product.name)
+    query = db.session.query(*columns).filter(Product.organization_id == user.organization_id)
+
+    category = request.args.get('category')
+    if category:
+        query = query.filter(Product.category == category)
+
+    try:
+        min_price = request.args.get('min_price')
+        if min_price:
+            query = query.filter(Product.price >= float(min_price))
+        max_price = request.args.get('max_price')
+        if max_price:
+            query = query.filter(Product.price <= float(max_price))
+    except ValueError:
+        return jsonify({"error": "Invalid price range."}), 400
+
+    search = request.args.get('q')
+    if search:
+        search = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('[', '\\[')
+        pattern = f"%{search}%" if request.args.get('match') == 'substring' else f"{search}%"
+        query = query.filter(Product.name.like(pattern, escape='\\'))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_name, cursor_id = decode_cursor(cursor)
+            UUID(cursor_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        query = query.filter(or_(
+            Product.name > cursor_name,
+            and_(Product.name == cursor_name, Product.id > cursor_id)
+        ))
+
+    limit = get_page_size()
+    rows = query.order_by(Product.name, Product.id).limit(limit + 1).all()
+
+    response = product_serializer.response(rows[:limit], fields)
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        response.headers['X-Next-Cursor'] = encode_cursor(last.name, last.id)
+    return response
\ No newline at end of file
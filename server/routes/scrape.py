@@ -0,0 +1,75 @@
+from app import app, db
+from flask import request, jsonify
+from uuid import UUID
+from datetime import datetime
+
+from models.scrape import ScrapeTerm
+from utils import admin_required
+
+@app.route('/scrape/terms', methods=['GET', 'POST'])
+@admin_required
+def scrape_terms():
+    if request.method == 'GET':
+        terms = ScrapeTerm.query.order_by(ScrapeTerm.priority.desc(), ScrapeTerm.search_term).all()
+        return jsonify([term.to_dict() for term in terms]), 200
+
+    data = request.json
+    search_term = (data.get('search_term') or '').strip()
+    if not search_term:
+        return jsonify({"error": "Search term is required."}), 400
+    if ScrapeTerm.query.filter_by(search_term=search_term).first():
+        return jsonify({"error": "Search term is already scheduled."}), 409
+
+    term = ScrapeTerm(
+        search_term=search_term,
+        refresh_interval=data.get('refresh_interval', 1440),
+        priority=data.get('priority', 0),
+        max_entries_pterm=data.get('max_entries_pterm', 6),
+        active=data.get('active', True),
+        next_run_at=datetime.utcnow()
+    )
+    db.session.add(term)
+    db.session.commit()
+    return jsonify(term.to_dict()), 201
+
+@app.route('/scrape/terms/<id>', methods=['PUT', 'DELETE'])
+@admin_required
+def scrape_term(id):
+    term = ScrapeTerm.query.filter_by(id=id).first()
+    if not term:
+        return jsonify({"error": "Search term could not be found."}), 404
+
+    if request.method == 'DELETE':
+        db.session.delete(term)
+        db.session.commit()
+        return {"id": id}, 204
+
+    data = request.json
+    term.refresh_interval = data.get('refresh_interval', term.refresh_interval)
+    term.priority = data.get('priority', term.priority)
+    term.max_entries_pterm = data.get('max_entries_pterm', term.max_entries_pterm)
+    term.active = data.get('active', term.active)
+    if data.get('run_now'):
+        term.next_run_at = datetime.utcnow()
+    db.session.commit()
+    return jsonify(term.to_dict()), 200
+
+@app.route('/scrape/run', methods=['POST'])
+@admin_required
+def run_scrapes():
+    """
+    Make the given search terms (or every active one) due now. They are scraped by
+    the next `flask scrape run`, since the browsers never run in the web process.
+    """
+    ids = (request.get_json(silent=True) or {}).get('ids')
+    try:
+        ids = [str(UUID(id)) for id in ids or []]
+    except (TypeError, ValueError, AttributeError):
+        return jsonify({"error": "ids must be a list of search term ids."}), 400
+    query = ScrapeTerm.query.filter(ScrapeTerm.id.in_(ids)) if ids else ScrapeTerm.query.filter_by(active=True)
+    terms = query.all()
+    now = datetime.utcnow()
+    for term in terms:
+        term.next_run_at = now
+    db.session.commit()
+    return jsonify([term.to_dict() for term in terms]), 202
@@ -0,0 +1,38 @@
+import math
+from app import app
+from flask import request, jsonify
+from datetime import datetime, timedelta
+
+from services.trends import get_search_term_growth, get_hashtag_growth
+from utils import auth_required
+
+TRENDS_MAX_DAYS = 365
+
+def get_window():
+    """Start of the window given by `?days=`. Raises ValueError unless it is a number of days in (0, TRENDS_MAX_DAYS]."""
+    try:
+        days = float(request.args.get('days', 7))
+    except ValueError:
+        raise ValueError("days must be a number.")
+    if not math.isfinite(days) or days <= 0 or days > TRENDS_MAX_DAYS:
+        raise ValueError(f"days must be greater than 0 and at most {TRENDS_MAX_DAYS}.")
+    return datetime.utcnow() - timedelta(days=days)
+
+@app.route('/trends/search_terms', methods=['GET'])
+@auth_required
+def search_term_trends():
+    try:
+        since = get_window()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(get_search_term_growth(since)), 200
+
+@app.route('/trends/hashtags', methods=['GET'])
+@auth_required
+def hashtag_trends():
+    try:
+        since = get_window()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    search_term = request.args.get('search_term', None)
+    return jsonify(get_hashtag_growth(since, search_term=search_term)), 200
@@ -4,7 +4,8 @@ from flask import request, jsonify, session
 
 from app import app, db
 from models.user import User
-from utils import auth_required, admin_required
+from utils import auth_required, admin_required, get_current_user, invalidate_principal
+from serializers import user_serializer
 
 bcrypt = Bcrypt(app)
 server_session = Session(app)
@@ -60,11 +61,12 @@ def login():
 @app.route('/profile', methods=['GET', 'PUT'])
 @auth_required
 def profile():
-    user = request.user 
+    user = get_current_user()
     if request.method == 'PUT':
         user.first_name = request.json.get('first_name', user.first_name)
         user.last_name = request.json.get('last_name', user.last_name)
         db.session.commit()
+        invalidate_principal(user.id)
     return jsonify({
             "id": user.id,
             "type": user.type,
@@ -83,17 +85,16 @@ def logout():
 @app.route('/delete_account', methods=['DELETE'])
 @auth_required
 def delete_account():
-    user = request.user
+    user = get_current_user()
     db.session.delete(user)
     db.session.commit()
+    invalidate_principal(user.id)
     session.pop('user_id')
     return '', 200
 
 @app.route('/users', methods=['GET'])
 @admin_required
 def users():
-    users = User.query.all()
-    return jsonify([
-        user.to_dict() for user in users
-    ]), 200
+    users = db.session.query(*user_serializer.columns()).all()
+    return user_serializer.response(users)
 
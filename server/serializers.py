@@ -0,0 +1,66 @@
+import threading
+import msgspec
+from flask import Response
+from sqlalchemy import Date, DateTime, Uuid
+
+from models.user import User
+from models.organization import Organization
+from models.content import Content
+from models.product import Product
+
+class ModelSerializer:
+    """
+    Precompiled serializer for result rows that select plain columns of `model`.
+    For every requested field list a dedicated function is generated once, which
+    turns a row into a dict without inspecting the model again.
+    """
+    def __init__(self, model, exclude=()):
+        self.model = model
+        self.fields = [column.name for column in model.__table__.columns if column.name not in exclude]
+        self._converters = {}
+        for column in model.__table__.columns:
+            if isinstance(column.type, DateTime):
+                self._converters[column.name] = lambda value, fmt=model.datetime_format: value.strftime(fmt)
+            elif isinstance(column.type, Date):
+                self._converters[column.name] = lambda value, fmt=model.date_format: value.strftime(fmt)
+            elif isinstance(column.type, Uuid):
+                self._converters[column.name] = str
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def columns(self, fields=None):
+        return [getattr(self.model, field) for field in (fields or self.fields)]
+
+    def compile(self, fields=None):
+        fields = tuple(fields or self.fields)
+        serialize = self._compiled.get(fields)
+        if serialize is None:
+            namespace = {}
+            items = []
+            for index, field in enumerate(fields):
+                converter = self._converters.get(field)
+                if converter is None:
+                    items.append(f"{field!r}: row[{index}]")
+                else:
+                    namespace[f"convert_{index}"] = converter
+                    items.append(f"{field!r}: None if row[{index}] is None else convert_{index}(row[{index}])")
+            exec(f"def serialize(row):\n    return {{{', '.join(items)}}}\n", namespace)
+            serialize = namespace["serialize"]
+            with self._lock:
+                self._compiled[fields] = serialize
+        return serialize
+
+    def to_dicts(self, rows, fields=None):
+        serialize = self.compile(fields)
+        return [serialize(row) for row in rows]
+
+    def to_json(self, rows, fields=None):
+        return msgspec.json.encode(self.to_dicts(rows, fields))
+
+    def response(self, rows, fields=None, status=200):
+        return Response(self.to_json(rows, fields), status=status, mimetype="application/json")
+
+user_serializer = ModelSerializer(User, exclude=('password',))
+organization_serializer = ModelSerializer(Organization)
+content_serializer = ModelSerializer(Content)
+product_serializer = ModelSerializer(Product)
@@ -0,0 +1,94 @@
+import os
+import click
+from uuid import uuid4
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app, db
+from models.blob import BlobTombstone
+from services.tools import get_blob_service_client
+from utils import get_blob_name, AZURE_CONTAINER_NAME
+
+BLOB_BATCH_SIZE = 256
+BLOB_DELETE_MAX_ATTEMPTS = int(os.getenv("BLOB_DELETE_MAX_ATTEMPTS", 8))
+BLOB_DELETE_RETRY_DELAY = int(os.getenv("BLOB_DELETE_RETRY_DELAY", 60))
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blob-delete")
+
+def queue_blob_deletion(urls):
+    """
+    Add a tombstone for every blob URL to the current session and return their ids.
+    The tombstones are committed together with the row that referenced the
+    blobs, so a crash between the commit and the purge never orphans them.
+    """
+    tombstones = [BlobTombstone(id=str(uuid4()), url=url) for url in urls if url]
+    db.session.add_all(tombstones)
+    return [tombstone.id for tombstone in tombstones]
+
+def discard_uploaded_media(urls):
+    """Delete images that were uploaded for a request or job that did not save them."""
+    tombstone_ids = queue_blob_deletion(urls)
+    db.session.commit()
+    purge_blobs_in_background(tombstone_ids)
+
+def purge_blobs_in_background(ids):
+    """Delete the blobs of already committed tombstones on the background worker."""
+    if ids:
+        _executor.submit(_purge_in_app_context, ids)
+
+def _purge_in_app_context(ids):
+    try:
+        with app.app_context():
+            purge_blobs(BlobTombstone.query.filter(BlobTombstone.id.in_(ids)).all())
+    except Exception as e:
+        print(f"Blob Deletion Error: {e}")
+
+def purge_blobs(tombstones):
+    """
+    Delete the blobs of `tombstones` with the Blob batch API and remove the
+    tombstones that succeeded. Failed deletions are rescheduled with an
+    exponential backoff. Returns the number of deleted blobs.
+    """
+    deleted = 0
+    container_client = get_blob_service_client().get_container_client(AZURE_CONTAINER_NAME)
+
+    invalid = [tombstone for tombstone in tombstones if not get_blob_name(tombstone.url)]
+    for tombstone in invalid:
+        print(f"Invalid image URL format: {tombstone.url}")
+        db.session.delete(tombstone)
+    tombstones = [tombstone for tombstone in tombstones if tombstone not in invalid]
+
+    for start in range(0, len(tombstones), BLOB_BATCH_SIZE):
+        batch = tombstones[start:start + BLOB_BATCH_SIZE]
+        try:
+            responses = list(container_client.delete_blobs(
+                *[get_blob_name(tombstone.url) for tombstone in batch],
+                raise_on_any_failure=False
+            ))
+            errors = [None if response.status_code in (202, 404) else f"HTTP {response.status_code}" for response in responses]
+        except Exception as e:
+            errors = [str(e)] * len(batch)
+
+        for tombstone, error in zip(batch, errors):
+            if error is None:
+                db.session.delete(tombstone)
+                deleted += 1
+            else:
+                tombstone.attempts += 1
+                tombstone.last_error = error
+                tombstone.next_attempt_at = datetime.utcnow() + timedelta(seconds=BLOB_DELETE_RETRY_DELAY * 2 ** tombstone.attempts)
+    db.session.commit()
+    return deleted
+
+def purge_due_blobs():
+    tombstones = BlobTombstone.query.filter(
+        BlobTombstone.next_attempt_at <= datetime.utcnow(),
+        BlobTombstone.attempts < BLOB_DELETE_MAX_ATTEMPTS
+    ).order_by(BlobTombstone.next_attempt_at).limit(BLOB_BATCH_SIZE * 10).all()
+    return purge_blobs(tombstones)
+
+@app.cli.command('purge-blobs')
+def purge_blobs_command():
+    """Retry the deletion of blobs whose tombstones are due."""
+    deleted = purge_due_blobs()
+    click.echo(f"Deleted {deleted} blobs.")
@@ -1,18 +1,37 @@
 import os
+import re
 import json
+import time
+import hashlib
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Annotated
 from pydantic import BaseModel, Field, ValidationError
-from azure.ai.contentsafety.models import AnalyzeTextOptions, TextCategory
 
-from langgraph.graph import StateGraph, END
-from langchain.agents import AgentExecutor, create_structured_chat_agent
-from langchain.prompts import ChatPromptTemplate, PromptTemplate, HumanMessagePromptTemplate
-
-from services.tools import llm, dalle, search_tool, content_safety_client
+from app import db
+from models.research import ResearchCache
+from services.cache import TTLCache
+from services.trends import find_trends, TRENDS_INDEX_DAYS
+from services.tools import get_llm, get_dalle, get_search_tool, get_content_safety_client, get_provider
 
 load_dotenv()
 
+RESEARCH_CACHE_TTL = int(os.getenv("RESEARCH_CACHE_TTL", 3600))
+RESEARCH_CACHE_SIZE = int(os.getenv("RESEARCH_CACHE_SIZE", 256))
+RESEARCH_CACHE_PERSIST = os.getenv("RESEARCH_CACHE_PERSIST", "False").lower() == "true"
+
+SAFETY_CACHE_TTL = int(os.getenv("SAFETY_CACHE_TTL", 86400))
+SAFETY_CACHE_SIZE = int(os.getenv("SAFETY_CACHE_SIZE", 1024))
+SAFETY_WORKERS = int(os.getenv("SAFETY_WORKERS", 4))
+SAFETY_CHUNK_SIZE = 10000  # Maximum text length of a single analyze_text request
+SAFETY_FAILED_TAG = "SafetyCheckFailed"  # Tag of generated content that did not pass the safety check
+WORKFLOW_MODES = ("full", "text_only", "media_only", "")  # "" only evaluates the given content
+
+research_cache = TTLCache("market_research", maxsize=RESEARCH_CACHE_SIZE, ttl=RESEARCH_CACHE_TTL)
+safety_cache = TTLCache("content_safety", maxsize=SAFETY_CACHE_SIZE, ttl=SAFETY_CACHE_TTL)
+_safety_executor = ThreadPoolExecutor(max_workers=SAFETY_WORKERS, thread_name_prefix="content-safety")
+
 class MarketResearch(BaseModel):
     trends: List[str] = Field(default_factory=list, description="Current trends related to the product or topic")
     keywords: List[str] = Field(default_factory=list, description="High-value SEO keywords with search volume data")
@@ -49,12 +68,54 @@ class ContentState(BaseModel):
     generated_analysis: Optional[str] = ""
     generated_recommendations: List[str] = []
 
+    timings: Dict[str, float] = {}
+    telemetry: Dict[str, Dict[str, int]] = {}
+
+def merge_content_state(current, update):
+    """Merge a node update into the workflow state so that parallel branches can write to it in the same step"""
+    merged = current.model_dump() if isinstance(current, ContentState) else dict(current)
+    updates = update.model_dump() if isinstance(update, ContentState) else dict(update)
+    timings = {**merged.get("timings", {}), **updates.get("timings", {})}
+    telemetry = {**merged.get("telemetry", {}), **updates.get("telemetry", {})}
+    merged.update(updates)
+    merged["timings"] = timings
+    merged["telemetry"] = telemetry
+    return ContentState(**merged)
+
+def timed_node(name, node, fields=None, images=False):
+    """
+    Wrap a workflow node to record its wall-clock time in `timings` and `telemetry`.
+    When `fields` is given, only those fields are returned so that the
+    node can run alongside other branches without overwriting their output.
+    When `images` is set, the number of generated images is recorded as well.
+    """
+    def run(state):
+        start = time.perf_counter()
+        content_state = node(state)
+        elapsed = round(time.perf_counter() - start, 3)
+        telemetry = {"ms": int(elapsed * 1000)}
+        if images:
+            telemetry["images"] = len(content_state.generated_media)
+        if fields is None:
+            content_state.timings = {**content_state.timings, name: elapsed}
+            content_state.telemetry = {**content_state.telemetry, name: telemetry}
+            return content_state
+        return {
+            **{field: getattr(content_state, field) for field in fields},
+            "timings": {name: elapsed},
+            "telemetry": {name: telemetry}
+        }
+    return run
+
 _research_agent = None
     
 def init_research_agent():
     global _research_agent
     if _research_agent is None:
-        tools = [search_tool]
+        from langchain.agents import AgentExecutor, create_structured_chat_agent
+        from langchain.prompts import ChatPromptTemplate, PromptTemplate, HumanMessagePromptTemplate
+
+        tools = [get_search_tool()]
 
         messages = [
             ("system", """You are an expert market research analyst specializing in content strategy and digital marketing.
@@ -73,7 +134,7 @@ def init_research_agent():
         research_prompt = ChatPromptTemplate.from_messages(messages)
 
         research_agent = create_structured_chat_agent(
-            llm, 
+            get_llm(), 
             tools, 
             research_prompt
         )
@@ -86,6 +147,74 @@ def init_research_agent():
         )
     return _research_agent
 
+def research_cache_key(content_state):
+    product = content_state.product or {}
+    parts = [
+        product.get("name"),
+        product.get("description"),
+        content_state.channel,
+        content_state.type,
+        content_state.objective,
+        content_state.audience
+    ]
+    normalized = "|".join(" ".join((part or "").lower().split()) for part in parts)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def get_cached_research(key):
+    research = research_cache.get(key)
+    if research is None and RESEARCH_CACHE_PERSIST:
+        try:
+            entry = db.session.get(ResearchCache, key)
+            now = datetime.utcnow()
+            if entry and entry.expires_at > now:
+                research = entry.research
+                research_cache.set(key, research, ttl=(entry.expires_at - now).total_seconds())
+        except Exception as e:
+            print(f"Research Cache Error: {e}")
+    return research
+
+def set_cached_research(key, research):
+    research_cache.set(key, research)
+    if RESEARCH_CACHE_PERSIST:
+        try:
+            db.session.merge(ResearchCache(
+                key=key,
+                research=research,
+                expires_at=datetime.utcnow() + timedelta(seconds=RESEARCH_CACHE_TTL)
+            ))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Research Cache Error: {e}")
+
+def get_indexed_research(content_state):
+    """Build the market research from the TikTok trends index, or return None if no fresh entry matches the content."""
+    product = content_state.product or {}
+    try:
+        entries = find_trends(product.get("category"), product.get("name"), content_state.title, content_state.objective)
+    except Exception as e:
+        db.session.rollback()
+        print(f"Trends Index Error: {e}")
+        return None
+    if not entries:
+        return None
+
+    hashtags = {}
+    for entry in entries:
+        for hashtag in entry["hashtags"]:
+            if hashtag["engagement_per_hour"] > hashtags.get(hashtag["hashtag"], {"engagement_per_hour": -1})["engagement_per_hour"]:
+                hashtags[hashtag["hashtag"]] = hashtag
+    top = sorted(hashtags.values(), key=lambda hashtag: hashtag["engagement_per_hour"], reverse=True)[:10]
+    search_terms = ", ".join(entry["search_term"] for entry in entries)
+
+    return {
+        "trends": [f"{hashtag['hashtag']} ({hashtag['engagement_per_hour']:g} engagements/hour on TikTok)" for hashtag in top],
+        "keywords": [hashtag["hashtag"] for hashtag in top],
+        "demographic": content_state.audience or f"TikTok users following {search_terms}",
+        "competition": f"{sum(hashtag['videos'] for hashtag in top)} TikTok videos on {search_terms} used these hashtags in the last {TRENDS_INDEX_DAYS} days; "
+                       f"the fastest growing are {', '.join(hashtag['hashtag'] for hashtag in top[:3])}."
+    }
+
 def conduct_market_research(state: Dict[str, Any]):
     """Research current trends and audience preferences for the content"""
     if isinstance(state, ContentState):
@@ -93,7 +222,20 @@ def conduct_market_research(state: Dict[str, Any]):
 
     content_state = ContentState(**state, exclude_unset=True)
 
-    research_agent = init_research_agent()
+    # Research shared by several items of a bulk generation is run once up front
+    if content_state.market_research:
+        return content_state
+
+    cache_key = research_cache_key(content_state)
+    cached_research = get_cached_research(cache_key)
+    if cached_research is not None:
+        content_state.market_research = cached_research
+        return content_state
+
+    indexed_research = get_indexed_research(content_state)
+    if indexed_research is not None:
+        content_state.market_research = indexed_research
+        return content_state
 
     research_prompt = f"""
     Provide brief market research insights for {content_state.type} on {content_state.channel}.
@@ -102,8 +244,8 @@ def conduct_market_research(state: Dict[str, Any]):
     summary of the competitive landscape.
     """
 
-    # Comment out the line below, if you are using a free tier account with a low token rate limit.
-    # research = research_agent.invoke({"input": research_prompt})
+    # The search agent is not used by default, since it needs a real search tool and a high token rate limit.
+    # research = init_research_agent().invoke({"input": research_prompt})
    
     conduct_market_research_prompt = f"""
     Provide market research insights for {content_state.type} on {content_state.channel}.
@@ -119,11 +261,12 @@ def conduct_market_research(state: Dict[str, Any]):
     Ensure precise, concise, and directly relevant information.
     """
 
-    conduct_market_research_llm = llm.with_structured_output(MarketResearch)
+    conduct_market_research_llm = get_llm().with_structured_output(MarketResearch)
 
     try:
         response = conduct_market_research_llm.invoke(conduct_market_research_prompt)
         content_state.market_research = response.model_dump()
+        set_cached_research(cache_key, content_state.market_research)
     except ValidationError as e:
         print(f"Market Research Validation Error: {e}")
         content_state.market_research = {
@@ -135,30 +278,76 @@ def conduct_market_research(state: Dict[str, Any]):
     
     return content_state
 
+def safety_cache_key(text):
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+def split_text(text, size=SAFETY_CHUNK_SIZE):
+    """Split `text` into chunks of at most `size` characters, preferably at whitespace."""
+    chunks = []
+    while len(text) > size:
+        cut = text.rfind(" ", 0, size)
+        if cut <= 0:
+            cut = size
+        chunks.append(text[:cut])
+        text = text[cut:]
+    chunks.append(text)
+    return chunks
+
+def analyze_text_safety(text):
+    # The Content Safety SDK is only needed for the real service; the stub takes the text as is
+    if get_provider("content_safety_client") == "stub":
+        options = text
+    else:
+        from azure.ai.contentsafety.models import AnalyzeTextOptions
+        options = AnalyzeTextOptions(text=text)
+
+    response = get_content_safety_client().analyze_text(options)
+    # Keyed by the category names of the service; other categories use a threshold of 2
+    severity_thresholds = {
+        "Hate": 2,
+        "Sexual": 2,
+        "Violence": 2,
+        "SelfHarm": 2
+    }
+    for analysis in getattr(response, "categories_analysis", None) or []:
+        if analysis.severity and analysis.severity > severity_thresholds.get(analysis.category, 2):
+            return False
+    # Responses of older SDK versions have one attribute per category instead
+    for category, attribute in (("Hate", "hate_result"), ("Sexual", "sexual_result"),
+                                ("Violence", "violence_result"), ("SelfHarm", "self_harm_result")):
+        result = getattr(response, attribute, None)
+        if result and result.severity > severity_thresholds[category]:
+            return False
+    return True
+
 def check_content_safety(text: str):
     """
     Check the safety of generated content using Azure AI Content Safety.
+    Verdicts are cached by the hash of the text; texts longer than the
+    service limit are split into chunks that are analyzed concurrently.
     """
-    try:
-        request_body = AnalyzeTextOptions(text=text)
-        response = content_safety_client.analyze_text(request_body)
-        severity_thresholds = {
-            TextCategory.HATE: 2,
-            TextCategory.SEXUAL: 2,
-            TextCategory.VIOLENCE: 2,
-            TextCategory.SELF_HARM: 2
-        }
-        for category in severity_thresholds:
-            result = getattr(response, f"{category.lower()}_result", None)
-            if result and result.severity > severity_thresholds[category]:
-                return False
+    if not text:
         return True
 
+    key = safety_cache_key(text)
+    verdict = safety_cache.get(key)
+    if verdict is not None:
+        return verdict
+
+    try:
+        chunks = split_text(text)
+        if len(chunks) == 1:
+            verdict = analyze_text_safety(chunks[0])
+        else:
+            verdict = all(_safety_executor.map(analyze_text_safety, chunks))
     except Exception as e:
+        # Fail open without caching, so the text is checked again next time
         print(f"Content Safety Check Error: {e}")
-        print(f"Full Response: {response}")
         return True
 
+    safety_cache.set(key, verdict)
+    return verdict
+
 def generate_content(state: Dict[str, Any]):
     """Generate text content based on market research"""
     if isinstance(state, ContentState):
@@ -190,7 +379,7 @@ def generate_content(state: Dict[str, Any]):
     }}
     """
 
-    generate_content_llm = llm.with_structured_output(GeneratedContent)
+    generate_content_llm = get_llm().with_structured_output(GeneratedContent)
 
     try:
         response = generate_content_llm.invoke(generate_content_prompt)
@@ -199,7 +388,7 @@ def generate_content(state: Dict[str, Any]):
             content_state.generated_tags = response.tags
         else:
             content_state.generated_text = "Content did not pass safety guidelines. Please review and regenerate."
-            content_state.generated_tags = ["SafetyCheckFailed"]
+            content_state.generated_tags = [SAFETY_FAILED_TAG]
     except ValidationError as e:
         print(f"Content Generation Validation Error: {e}")
     
@@ -225,7 +414,7 @@ def generate_media(state: Dict[str, Any]):
     """
     
     try:
-        response = dalle.images.generate(
+        response = get_dalle().images.generate(
             model=os.getenv("AZURE_DALLE_DEPLOYMENT_NAME"),
             prompt=generate_media_prompt,
             n=content_state.number_of_images,
@@ -270,7 +459,7 @@ def evaluate_content(state: Dict[str, Any]):
     Provide a comprehensive, actionable evaluation.
     """
     
-    evaluate_content_llm = llm.with_structured_output(ContentEvaluation)
+    evaluate_content_llm = get_llm().with_structured_output(ContentEvaluation)
     
     try:
         response = evaluate_content_llm.invoke(evaluation_prompt)
@@ -281,21 +470,131 @@ def evaluate_content(state: Dict[str, Any]):
         print(f"Content Evaluation Validation Error: {e}")
     return content_state
 
+class JsonStringFieldStream:
+    """Incrementally decode the string value of `field` from the fragments of a streamed JSON object."""
+    ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+    def __init__(self, field):
+        self.pattern = re.compile(rf'"{field}"\s*:\s*"')
+        self.buffer = ""
+        self.position = None
+        self.done = False
+
+    def feed(self, fragment):
+        """Add a fragment and return the newly decoded characters of the value."""
+        if self.done or not fragment:
+            return ""
+        self.buffer += fragment
+        if self.position is None:
+            match = self.pattern.search(self.buffer)
+            if not match:
+                return ""
+            self.position = match.end()
+
+        decoded = []
+        index = self.position
+        while index < len(self.buffer):
+            char = self.buffer[index]
+            if char == '"':
+                self.done = True
+                break
+            if char == "\\":
+                # Wait for the rest of an escape sequence that was split across fragments
+                if index + 1 >= len(self.buffer):
+                    break
+                escape = self.buffer[index + 1]
+                if escape == "u":
+                    if index + 6 > len(self.buffer):
+                        break
+                    decoded.append(chr(int(self.buffer[index + 2:index + 6], 16)))
+                    index += 6
+                else:
+                    decoded.append(self.ESCAPES.get(escape, escape))
+                    index += 2
+                continue
+            decoded.append(char)
+            index += 1
+        self.position = index
+        return "".join(decoded)
+
+def run_workflow(state, mode="full", workflow=None):
+    """
+    Run the content workflow on `state` and return the final state, with the
+    token usage and failed LLM calls of every node added to its `telemetry`.
+    """
+    from services.telemetry import create_usage_handler
+
+    usage = create_usage_handler()
+    final_state = (workflow or init_workflow(mode)).invoke(state, config={"callbacks": [usage]})
+    final_state.telemetry = usage.merge(final_state.telemetry)
+    return final_state
+
+def stream_workflow(state, mode="full"):
+    """
+    Run the content workflow like `run_workflow(state, mode)` while yielding
+    ("node", ...) events as nodes finish and ("token", ...) events for every fragment
+    of the generated text. The fragments are held back until the generated text
+    passed the safety check; when it failed, a ("safety", ...) event with the
+    replacement text is yielded instead. The final state is yielded last as
+    ("state", final_state).
+    """
+    from services.telemetry import create_usage_handler
+
+    workflow = init_workflow(mode)
+    usage = create_usage_handler()
+    text = JsonStringFieldStream("text")
+    tokens = []
+    final_state = None
+
+    for stream_mode, chunk in workflow.stream(state, stream_mode=["updates", "messages", "values"], config={"callbacks": [usage]}):
+        if stream_mode == "values":
+            final_state = chunk
+        elif stream_mode == "updates":
+            for node, update in chunk.items():
+                update = update.model_dump() if isinstance(update, ContentState) else (update or {})
+                if node == "generate_content":
+                    if SAFETY_FAILED_TAG in (update.get("generated_tags") or []):
+                        yield "safety", {"text": update.get("generated_text")}
+                    elif update.get("generated_text"):
+                        for delta in tokens:
+                            yield "token", {"text": delta}
+                    tokens = []
+                yield "node", {"node": node, "elapsed": update.get("timings", {}).get(node)}
+        elif stream_mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") != "generate_content":
+                continue
+            if isinstance(message.content, str) and message.content:
+                fragment = message.content
+            else:
+                fragment = "".join(tool_call.get("args") or "" for tool_call in getattr(message, "tool_call_chunks", []))
+            delta = text.feed(fragment)
+            if delta:
+                tokens.append(delta)
+
+    final_state.telemetry = usage.merge(final_state.telemetry)
+    yield "state", final_state
+
 def init_workflow(mode="full"):
-    workflow = StateGraph(dict)
+    from langgraph.graph import StateGraph, END
 
-    workflow.add_node("market_research", conduct_market_research)
+    workflow = StateGraph(Annotated[dict, merge_content_state])
 
-    if mode=="full" or mode=="text_only":
-        workflow.add_node("generate_content", generate_content)
-    if mode=="full" or mode=="media_only":
-        workflow.add_node("generate_media", generate_media)
-    workflow.add_node("evaluate_content", evaluate_content)
+    workflow.add_node("market_research", timed_node("market_research", conduct_market_research))
+
+    if mode=="full":
+        workflow.add_node("generate_content", timed_node("generate_content", generate_content, ["generated_text", "generated_tags"]))
+        workflow.add_node("generate_media", timed_node("generate_media", generate_media, ["generated_media"], images=True))
+    elif mode=="text_only":
+        workflow.add_node("generate_content", timed_node("generate_content", generate_content))
+    elif mode=="media_only":
+        workflow.add_node("generate_media", timed_node("generate_media", generate_media, images=True))
+    workflow.add_node("evaluate_content", timed_node("evaluate_content", evaluate_content))
 
     if mode=="full":
         workflow.add_edge("market_research", "generate_content")
-        workflow.add_edge("generate_content", "generate_media")
-        workflow.add_edge("generate_media", "evaluate_content")
+        workflow.add_edge("market_research", "generate_media")
+        workflow.add_edge(["generate_content", "generate_media"], "evaluate_content")
     elif mode=="text_only":
         workflow.add_edge("market_research", "generate_content")
         workflow.add_edge("generate_content", "evaluate_content")
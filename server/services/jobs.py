@@ -0,0 +1,153 @@
+import os
+import time
+import socket
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, func
+
+from app import app, db
+from models.job import Job
+from services.blobs import queue_blob_deletion, purge_blobs_in_background
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", 4))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", 32))
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", 30))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 120))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_slots = threading.BoundedSemaphore(JOB_QUEUE_LIMIT)
+_active_jobs = set()
+_active_lock = threading.Lock()
+_heartbeat_thread = None
+
+class JobQueueFull(Exception):
+    pass
+
+def acquire_job_slot():
+    """Reserve a slot of the job queue for work that runs outside of the worker pool."""
+    if not _slots.acquire(blocking=False):
+        raise JobQueueFull("The job queue is full. Please try again later.")
+
+def release_job_slot():
+    _slots.release()
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def renew_job_leases():
+    """Extend the lease of the jobs queued or running in this process."""
+    with _active_lock:
+        ids = list(_active_jobs)
+    if ids:
+        Job.query.filter(Job.id.in_(ids), Job.status.in_(('queued', 'running'))).update(
+            {Job.heartbeat_at: func.current_timestamp()}, synchronize_session=False)
+        db.session.commit()
+
+def fail_expired_jobs():
+    """
+    Mark the queued or running jobs whose lease expired as failed and queue their
+    uploaded media for deletion. Their process stopped renewing the lease, so they
+    would otherwise never finish. Returns the number of failed jobs.
+    """
+    # Both sides of the comparison use the database clock
+    now = db.session.scalar(select(func.current_timestamp()))
+    expired = Job.query.filter(
+        Job.status.in_(('queued', 'running')),
+        func.coalesce(Job.heartbeat_at, Job.created_at) < now - timedelta(seconds=JOB_LEASE_SECONDS)
+    ).all()
+
+    tombstone_ids = []
+    for job in expired:
+        job.status = 'failed'
+        job.error = "The server stopped before the job finished."
+        job.finished_at = now
+        tombstone_ids += queue_blob_deletion((job.payload or {}).get("media", []))
+    db.session.commit()
+    purge_blobs_in_background(tombstone_ids)
+    return len(expired)
+
+def _heartbeat():
+    while True:
+        try:
+            with app.app_context():
+                renew_job_leases()
+                expired = fail_expired_jobs()
+                if expired:
+                    print(f"Marked {expired} interrupted jobs as failed")
+        except Exception as e:
+            print(f"Job Heartbeat Error: {e}")
+        time.sleep(JOB_HEARTBEAT_SECONDS)
+
+@app.before_request
+def start_job_heartbeat():
+    # Started on the first request, since the server does not connect to the database on startup
+    global _heartbeat_thread
+    if _heartbeat_thread is not None:
+        return
+    with _active_lock:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+def submit_job(type, organization_id, task, *args, payload=None, content_id=None):
+    """
+    Persist a queued Job row and schedule `task(*args)` on the worker pool.
+    The task runs inside an application context and returns the id of the
+    Content row it created or updated, or a dict that is stored as the result.
+    """
+    acquire_job_slot()
+
+    try:
+        job = Job(
+            type=type,
+            status='queued',
+            payload=payload or {},
+            content_id=content_id,
+            organization_id=organization_id,
+            worker=worker_id(),
+            heartbeat_at=func.current_timestamp()
+        )
+        db.session.add(job)
+        db.session.commit()
+        with _active_lock:
+            _active_jobs.add(job.id)
+        _executor.submit(_run_job, job.id, task, args)
+    except Exception:
+        _slots.release()
+        raise
+    return job
+
+def _run_job(job_id, task, args):
+    try:
+        with app.app_context():
+            job = db.session.get(Job, job_id)
+            job.status = 'running'
+            job.started_at = datetime.utcnow()
+            job.heartbeat_at = func.current_timestamp()
+            db.session.commit()
+
+            tombstone_ids = []
+            try:
+                result = task(*args)
+                job = db.session.get(Job, job_id)
+                job.status = 'completed'
+                if isinstance(result, dict):
+                    job.result = result
+                else:
+                    job.content_id = result
+            except Exception as e:
+                print(f"Job {job_id} Error: {e}")
+                db.session.rollback()
+                job = db.session.get(Job, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+                tombstone_ids = queue_blob_deletion((job.payload or {}).get("media", []))
+
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            purge_blobs_in_background(tombstone_ids)
+    finally:
+        with _active_lock:
+            _active_jobs.discard(job_id)
+        _slots.release()
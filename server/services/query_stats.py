@@ -0,0 +1,85 @@
+import os
+import time
+import threading
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import app
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 500))
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", "False").lower() == "true"
+
+_endpoints = {}
+_lock = threading.Lock()
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    connection.info.setdefault("query_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    elapsed = (time.perf_counter() - connection.info["query_start"].pop()) * 1000
+    if elapsed >= SLOW_QUERY_MS:
+        endpoint = request.endpoint if has_request_context() else None
+        print(f"Slow Query ({elapsed:.1f} ms, {endpoint or 'background'}): {' '.join(statement.split())[:1000]}")
+
+    if has_request_context() and "query_count" in g:
+        g.query_count += 1
+        g.query_time += elapsed
+        if elapsed > g.slowest_query[0]:
+            g.slowest_query = (elapsed, statement)
+
+@event.listens_for(Engine, "handle_error")
+def handle_error(context):
+    # Failed statements never reach after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+@app.before_request
+def start_query_stats():
+    g.query_count = 0
+    g.query_time = 0.0
+    g.slowest_query = (0.0, None)
+
+@app.after_request
+def record_query_stats(response):
+    if "query_count" not in g:
+        return response
+
+    slowest_time, slowest_statement = g.slowest_query
+    with _lock:
+        stats = _endpoints.setdefault(request.endpoint or request.path, {
+            "requests": 0, "queries": 0, "max_queries": 0, "time_ms": 0.0, "slowest_ms": 0.0, "slowest_statement": None
+        })
+        stats["requests"] += 1
+        stats["queries"] += g.query_count
+        stats["max_queries"] = max(stats["max_queries"], g.query_count)
+        stats["time_ms"] += g.query_time
+        if slowest_time > stats["slowest_ms"]:
+            stats["slowest_ms"] = slowest_time
+            stats["slowest_statement"] = " ".join(slowest_statement.split())[:1000]
+
+    if app.debug or QUERY_STATS_HEADERS:
+        response.headers["X-DB-Queries"] = str(g.query_count)
+        response.headers["X-DB-Time-Ms"] = f"{g.query_time:.2f}"
+        response.headers["X-DB-Slowest-Ms"] = f"{slowest_time:.2f}"
+    return response
+
+def get_query_stats():
+    """Query count and database time per endpoint since the start of the process."""
+    with _lock:
+        return {
+            endpoint: {
+                "requests": stats["requests"],
+                "queries_per_request": round(stats["queries"] / stats["requests"], 2),
+                "max_queries": stats["max_queries"],
+                "time_ms_per_request": round(stats["time_ms"] / stats["requests"], 2),
+                "slowest_ms": round(stats["slowest_ms"], 2),
+                "slowest_statement": stats["slowest_statement"]
+            } for endpoint, stats in _endpoints.items()
+        }
+
+def reset_query_stats():
+    with _lock:
+        _endpoints.clear()
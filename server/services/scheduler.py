@@ -0,0 +1,146 @@
+import os
+import click
+import hashlib
+from datetime import datetime, timedelta
+from flask.cli import AppGroup
+from sqlalchemy import or_
+
+from app import app, db
+from models.scrape import ScrapeTerm
+from services.trends import build_trends_index
+
+SCRAPE_SCHEDULE_BATCH = int(os.getenv("SCRAPE_SCHEDULE_BATCH", 10))
+SCRAPE_STALE_HOURS = int(os.getenv("SCRAPE_STALE_HOURS", 24))
+SCRAPE_CLAIM_MINUTES = int(os.getenv("SCRAPE_CLAIM_MINUTES", 60))
+
+def result_hash(videos):
+    """Fingerprint of a search result page, independent of the order of the videos."""
+    return hashlib.sha256(",".join(sorted(video["id"] for video in videos)).encode("utf-8")).hexdigest()
+
+def get_due_terms(now=None, limit=None):
+    """Active search terms whose refresh interval has elapsed, highest priority first."""
+    now = now or datetime.utcnow()
+    return ScrapeTerm.query.filter(
+        ScrapeTerm.active == True,
+        or_(ScrapeTerm.next_run_at == None, ScrapeTerm.next_run_at <= now)
+    ).order_by(ScrapeTerm.priority.desc(), ScrapeTerm.next_run_at).limit(limit or SCRAPE_SCHEDULE_BATCH).all()
+
+def run_due_terms(limit=None, workers=None, rate_limit=None):
+    """
+    Scrape the search terms that are due on the browser pool. The search page of
+    every term is loaded first; when it lists the same videos as the last run and
+    the term was fully scraped within SCRAPE_STALE_HOURS, its video pages are
+    skipped. Every term is saved as soon as its video pages are done, and its next
+    run and result fingerprint only move on once that save succeeded; a term that
+    fails is retried after SCRAPE_CLAIM_MINUTES. The trends index is rebuilt when
+    new videos were saved.
+    Returns the processed terms. Must be called inside an application context.
+    """
+    from services.scrapers.tiktok import tiktok_scraper, save_tiktok_data_to_db
+
+    now = datetime.utcnow()
+    terms = get_due_terms(now, limit)
+    if not terms:
+        return []
+
+    # Claim the terms first, so an overlapping scheduler run does not pick them up again
+    for term in terms:
+        term.last_status = 'running'
+        term.last_error = None
+        term.last_run_at = now
+        term.next_run_at = now + timedelta(minutes=SCRAPE_CLAIM_MINUTES)
+    db.session.commit()
+
+    by_search_term = {term.search_term: term for term in terms}
+    digests = {}
+
+    def select(search_term, videos):
+        term = by_search_term[search_term]
+        digests[search_term] = result_hash(videos)
+        fresh = term.last_scraped_at and term.last_scraped_at > now - timedelta(hours=SCRAPE_STALE_HOURS)
+        return not (digests[search_term] == term.last_result_hash and fresh)
+
+    saved = False
+    try:
+        searches = [(term.search_term, term.max_entries_pterm) for term in terms]
+        for search_term, videos, scraped in tiktok_scraper().scrape_tiktok_search_by_term(searches, select, workers, rate_limit):
+            term = by_search_term[search_term]
+            if videos is None:
+                term.last_status = 'failed'
+                term.last_error = "The search page could not be scraped."
+            elif scraped is None:
+                term.last_status = 'unchanged'
+                term.next_run_at = now + timedelta(minutes=term.refresh_interval)
+                print(f"Skipping {term.search_term}: results have not changed")
+            elif scraped and not save_tiktok_data_to_db(scraped):
+                term.last_status = 'failed'
+                term.last_error = "The scraped videos could not be saved."
+            else:
+                saved = saved or bool(scraped)
+                term.last_scraped_at = now
+                term.next_run_at = now + timedelta(minutes=term.refresh_interval)
+                if len(scraped) == len(videos):
+                    term.last_status = 'completed'
+                    term.last_result_hash = digests[search_term]
+                else:
+                    # Keep the old fingerprint, so the missing videos are retried on the next run
+                    term.last_status = 'incomplete'
+            db.session.commit()
+    except BaseException as e:
+        db.session.rollback()
+        for term in terms:
+            if term.last_status == 'running':
+                term.last_status = 'failed'
+                term.last_error = str(e)
+        raise
+    finally:
+        db.session.commit()
+
+    if saved:
+        build_trends_index()
+    return terms
+
+scrape_cli = AppGroup('scrape', help="Manage the scheduled TikTok search terms.")
+
+@scrape_cli.command('add')
+@click.argument('search_term')
+@click.option('--interval', type=int, default=1440, help="Refresh interval in minutes")
+@click.option('--priority', type=int, default=0, help="Terms with a higher priority are scraped first")
+@click.option('--max-entries', type=int, default=6, help="Videos to scrape per run")
+def add_term_command(search_term, interval, priority, max_entries):
+    """Add a search term or update its schedule."""
+    term = ScrapeTerm.query.filter_by(search_term=search_term).first()
+    if not term:
+        term = ScrapeTerm(search_term=search_term)
+        db.session.add(term)
+    term.refresh_interval = interval
+    term.priority = priority
+    term.max_entries_pterm = max_entries
+    term.active = True
+    db.session.commit()
+    click.echo(f"Scheduled {search_term} every {interval} minutes.")
+
+@scrape_cli.command('remove')
+@click.argument('search_term')
+def remove_term_command(search_term):
+    """Remove a search term from the schedule."""
+    deleted = ScrapeTerm.query.filter_by(search_term=search_term).delete()
+    db.session.commit()
+    click.echo(f"Removed {deleted} search terms.")
+
+@scrape_cli.command('list')
+def list_terms_command():
+    """List the scheduled search terms."""
+    for term in ScrapeTerm.query.order_by(ScrapeTerm.priority.desc(), ScrapeTerm.search_term).all():
+        click.echo(f"{term.search_term}: every {term.refresh_interval} min, priority {term.priority}, "
+                   f"{'active' if term.active else 'paused'}, last {term.last_status or 'never'} at {term.last_run_at}, next at {term.next_run_at}")
+
+@scrape_cli.command('run')
+@click.option('--limit', type=int, default=None, help="Maximum number of due terms to scrape")
+@click.option('--workers', type=int, default=None, help="Number of browser processes")
+def run_terms_command(limit, workers):
+    """Scrape the search terms that are due."""
+    for term in run_due_terms(limit=limit, workers=workers):
+        click.echo(f"{term.search_term}: {term.last_status}")
+
+app.cli.add_command(scrape_cli)
@@ -1,25 +1,60 @@
 import re
+import urllib.parse
+import multiprocessing
 from datetime import datetime, timedelta
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from config import Configuration
 import time
+import logging
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.scrapers.tiktok_http import fetch_video_metadata, convert_to_int
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", 3))
+SCRAPER_RATE_LIMIT = float(os.getenv("SCRAPER_RATE_LIMIT", 2))
+SCRAPER_HTTP_FETCH = os.getenv("SCRAPER_HTTP_FETCH", "true").lower() == "true"
+
+class RateLimiter:
+    """Process-safe limiter that spaces page loads evenly across every scraping worker."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._lock = multiprocessing.Lock()
+        self._next_slot = multiprocessing.Value('d', 0.0, lock=False)
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.time()
+            delay = self._next_slot.value - now
+            self._next_slot.value = max(now, self._next_slot.value) + self.interval
+        if delay > 0:
+            time.sleep(delay)
 
 class tiktok_scraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, base_url="https://www.tiktok.com", rate_limiter=None, http_fetch=None):
+        self.headless = headless
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter
+        self.http_fetch = SCRAPER_HTTP_FETCH if http_fetch is None else http_fetch
+
         # Set up headless Chrome browser
         self.chrome_options = Options()
-        # Uncomment these for headless mode if needed
-        self.chrome_options.add_argument("--headless")
+        if headless:
+            self.chrome_options.add_argument("--headless")
         self.chrome_options.add_argument("--no-sandbox")
         self.chrome_options.add_argument("--disable-dev-shm-usage")
         self.chrome_options.add_argument("--log-level=3")
@@ -30,118 +65,271 @@ class tiktok_scraper:
     def get_driver(self):
         """Initialize and return a new webdriver instance."""
         return webdriver.Chrome(options=self.chrome_options)
+
+    def _open(self, driver, url):
+        """Load a page, waiting for the global rate limit if one is set."""
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        driver.get(url)
     
     def scrape_tiktok_search(self, search_terms=None, max_entries_pterm=6):
-        
+        """Scrape TikTok search results with enhanced metadata."""
         if search_terms is None:     
             search_terms = ["Books", "Skincare", "Fashion"]
             
-        """Scrape TikTok search results with enhanced metadata."""
         driver = self.get_driver()
         
         # Store extracted data
         scraped_data = []
         
-        for search_term in search_terms:
+        try:
+            for search_term in search_terms:
+                try:
+                    for video in self._search_videos(driver, search_term, max_entries_pterm):
+                        video_data = self._scrape_video(driver, video)
+                        if video_data:
+                            scraped_data.append(video_data)
+                
+                except Exception as outer_error:
+                    # Keep what was scraped so far and move on to the next term
+                    logger.error(f"Overall scraping error: {outer_error}")
+        finally:
+            driver.quit()
+        return scraped_data
+
+    def scrape_tiktok_search_parallel(self, search_terms=None, max_entries_pterm=6, workers=None, rate_limit=None):
+        """
+        Scrape TikTok search results on a pool of browser processes.
+        Search pages are sharded across the workers first, then every video
+        detail page; each worker reuses one Chrome instance for all of its
+        pages and every page load goes through a shared rate limit.
+        """
+        if search_terms is None:
+            search_terms = ["Books", "Skincare", "Fashion"]
+
+        with self._worker_pool(workers, rate_limit) as executor:
+            searches = executor.map(_search_task, search_terms, [max_entries_pterm] * len(search_terms))
+            videos = [video for result in searches for video in result or []]
+            return [video_data for video_data in executor.map(_video_task, videos) if video_data]
+
+    def scrape_tiktok_search_by_term(self, searches, select=None, workers=None, rate_limit=None):
+        """
+        Scrape TikTok search results on the browser pool and yield each search
+        term as soon as all of its video pages are done, so callers can save it
+        while the other terms are still scraped.
+
+        Args:
+            searches (list): (search_term, max_entries_pterm) pairs
+            select (callable): Called with the search term and the videos of its
+                search page; the video pages of the term are skipped when it returns False
+
+        Yields:
+            tuple: (search_term, videos, scraped) where videos is None when the
+            search page failed and scraped is None when the term was skipped
+        """
+        with self._worker_pool(workers, rate_limit) as executor:
+            futures = {
+                executor.submit(_search_task, search_term, max_entries_pterm): search_term
+                for search_term, max_entries_pterm in searches
+            }
+            selected = {}
+            for future in as_completed(futures):
+                search_term = futures[future]
+                videos = future.result()
+                if videos is None or (select and not select(search_term, videos)):
+                    yield search_term, videos, None
+                else:
+                    selected[search_term] = videos
+
+            futures = {
+                executor.submit(_video_task, video): search_term
+                for search_term, videos in selected.items()
+                for video in videos
+            }
+            remaining = {search_term: len(videos) for search_term, videos in selected.items()}
+            scraped = {search_term: [] for search_term in selected}
+            for search_term in [search_term for search_term, count in remaining.items() if not count]:
+                yield search_term, selected[search_term], scraped[search_term]
+            for future in as_completed(futures):
+                search_term = futures[future]
+                video_data = future.result()
+                if video_data:
+                    scraped[search_term].append(video_data)
+                remaining[search_term] -= 1
+                if not remaining[search_term]:
+                    yield search_term, selected[search_term], scraped[search_term]
+
+    def scrape_tiktok_search_checkpointed(self, search_terms=None, max_entries_pterm=6, run_id=None, workers=None, rate_limit=None):
+        """
+        Scrape TikTok search results as a ScrapeRun on the browser pool.
+        Every video is saved as soon as it is extracted and the progress of each
+        search term is recorded, so passing the id of an interrupted run resumes
+        it: searches that already finished and videos that were already saved
+        are skipped. Must be called inside an application context.
+        """
+        if run_id:
+            run = db.session.get(ScrapeRun, run_id)
+            if not run:
+                raise ValueError(f"Scrape run {run_id} could not be found.")
+        else:
+            if search_terms is None:
+                search_terms = ["Books", "Skincare", "Fashion"]
+            run = ScrapeRun(max_entries_pterm=max_entries_pterm)
+            run.terms = [ScrapeRunTerm(search_term=search_term, scraped=[]) for search_term in search_terms]
+            db.session.add(run)
+        run.status = 'running'
+        run.error = None
+        db.session.commit()
+        logger.info(f"Scrape run {run.id}")
+
+        terms = [term for term in run.terms if term.status != 'completed']
+        try:
+            with self._worker_pool(workers, rate_limit) as executor:
+                searches = {
+                    executor.submit(_search_task, term.search_term, run.max_entries_pterm): term
+                    for term in terms if term.videos is None
+                }
+                for future in as_completed(searches):
+                    term = searches[future]
+                    videos = future.result()
+                    if videos is None:
+                        term.status = 'failed'
+                    else:
+                        term.videos = videos
+                        term.status = 'searched'
+                    db.session.commit()
+
+                scrapes = {
+                    executor.submit(_video_task, video): term
+                    for term in terms if term.videos is not None
+                    for video in term.videos if video["id"] not in term.scraped
+                }
+                for future in as_completed(scrapes):
+                    term = scrapes[future]
+                    video_data = future.result()
+                    # A video is only checkpointed once it is saved, so a resumed run retries the rest
+                    if video_data and save_tiktok_data_to_db([video_data]):
+                        term.scraped = term.scraped + [video_data["id"]]
+                        db.session.commit()
+
+            for term in terms:
+                if term.videos is not None and all(video["id"] in term.scraped for video in term.videos):
+                    term.status = 'completed'
+            run.status = 'completed' if all(term.status == 'completed' for term in run.terms) else 'incomplete'
+        except BaseException as e:
+            db.session.rollback()
+            run.status = 'interrupted'
+            run.error = str(e)
+            raise
+        finally:
+            run.finished_at = datetime.utcnow()
+            db.session.commit()
+        return run
+
+    def _worker_pool(self, workers=None, rate_limit=None):
+        """Create a pool of browser processes that share one rate limiter."""
+        return ProcessPoolExecutor(
+            max_workers=workers or SCRAPER_WORKERS,
+            initializer=_init_worker,
+            initargs=(self.headless, self.base_url, RateLimiter(SCRAPER_RATE_LIMIT if rate_limit is None else rate_limit), self.http_fetch)
+        )
+
+    def _search_videos(self, driver, search_term, max_entries_pterm):
+        """Collect the video cards listed on the search page of `search_term`."""
+        url = f"{self.base_url}/search?q={urllib.parse.quote(search_term)}"
+        logger.info(f"Searching URL: {url}")
+        
+        self._open(driver, url)
+        
+        # Wait for search results to load
+        video_containers = WebDriverWait(driver, 20).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div[class*="DivItemContainerForSearch"]'))
+        )
+
+        videos = []
+        for vid_container in video_containers[0:max_entries_pterm]:                
+
             try:
-                search_term = search_term.replace(" ", "%20")  # Replace spaces with URL encoding
-                url = f"https://www.tiktok.com/search?q={search_term}"
-                print(f"Searching URL: {url}")
+                # Extract video caption
+                main_text = vid_container.find_element(
+                    By.CSS_SELECTOR, "[data-e2e='search-card-video-caption'] span"
+                ).text
                 
-                driver.get(url)
+                # Extract hashtags
+                hashtags_elements = vid_container.find_elements(
+                    By.CSS_SELECTOR, "a[data-e2e='search-common-link']"
+                )
+                hashtags = []
+                
+                for tag in hashtags_elements:
+                    aria_label = tag.get_attribute("aria-label")
+                    if aria_label:
+                        match = re.search(r'#(\w+)', aria_label)
+                        if match:
+                            hashtags.append(f"#{match.group(1)}")
                 
-                # Wait for search results to load
-                video_containers = WebDriverWait(driver, 20).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div[class*="DivItemContainerForSearch"]'))
+                # Find video link
+                video_link_containers = vid_container.find_elements(
+                    By.CSS_SELECTOR, "a[class*=AVideoContainer]"
                 )
                 
-                for vid_container in video_containers[0:max_entries_pterm]:                
-
-                    try:
-                        # Extract video caption
-                        main_text = vid_container.find_element(
-                            By.CSS_SELECTOR, "[data-e2e='search-card-video-caption'] span"
-                        ).text
-                        
-                        # Extract hashtags
-                        hashtags_elements = vid_container.find_elements(
-                            By.CSS_SELECTOR, "a[data-e2e='search-common-link']"
-                        )
-                        hashtags = []
-                        
-                        for tag in hashtags_elements:
-                            aria_label = tag.get_attribute("aria-label")
-                            if aria_label:
-                                match = re.search(r'#(\w+)', aria_label)
-                                if match:
-                                    hashtags.append(f"#{match.group(1)}")
-                        
-                        # Find video link
-                        video_link_containers = vid_container.find_elements(
-                            By.CSS_SELECTOR, "a[class*=AVideoContainer]"
-                        )
-                        
-                        if not video_link_containers:
-                            print("No video link found for this container")
-                            continue
-                        
-                        video_link = video_link_containers[0].get_attribute("href")
-                        
-                        # Extract video and user IDs
-                        video_parts = video_link.split("/")
-                        user_id = video_parts[-3] if len(video_parts) > 3 else "Unknown"
-                        video_id = video_parts[-1] if len(video_parts) > 1 else "Unknown"
-                        
-                        # Extract upload date
-                        date_element = vid_container.find_element(
-                            By.CSS_SELECTOR, "div[class*='DivTimeTag']"
-                        ).text
-                        
-                        # Process date
-                        processed_date = self._process_date(date_element)
-                        
-                        # Open video to get detailed metadata
-                        driver.execute_script(f"window.open('{video_link}', '_blank');")
-                        driver.switch_to.window(driver.window_handles[-1])
-                        
-                        try:
-                            # Extended metadata extraction
-                            metadata = self._extract_video_metadata(driver)
-                            
-                            # Combine with existing data
-                            video_data = {
-                                "id": video_id,
-                                "main_text": main_text,
-                                "hashtags": hashtags,
-                                "user_id": user_id, 
-                                "upload_date": processed_date,
-                                "video_link": video_link,
-                                **metadata,  # Spread the additional metadata
-                                "Search Term": search_term
-                            }
-                            
-                            scraped_data.append(video_data)
-                            
-                            print(f"Scraped detailed video by {user_id}")
-                        
-                        except Exception as metadata_error:
-                            print(f"Error extracting video metadata: {metadata_error}")
-                        
-                        # Close video tab and switch back
-                        driver.close()
-                        driver.switch_to.window(driver.window_handles[0])
-                    
-                    except Exception as inner_error:
-                        print(f"Error processing video container: {inner_error}")
+                if not video_link_containers:
+                    logger.warning("No video link found for this container")
+                    continue
                 
+                video_link = video_link_containers[0].get_attribute("href")
                 
+                # Extract video and user IDs
+                video_parts = video_link.split("/")
+                user_id = video_parts[-3] if len(video_parts) > 3 else "Unknown"
+                video_id = video_parts[-1] if len(video_parts) > 1 else "Unknown"
+                
+                # Extract upload date
+                date_element = vid_container.find_element(
+                    By.CSS_SELECTOR, "div[class*='DivTimeTag']"
+                ).text
+                
+                videos.append({
+                    "id": video_id,
+                    "main_text": main_text,
+                    "hashtags": hashtags,
+                    "user_id": user_id, 
+                    "upload_date": self._process_date(date_element),
+                    "video_link": video_link,
+                    "Search Term": search_term
+                })
             
-            except Exception as outer_error:
-                print(f"Overall scraping error: {outer_error}")
-                return []
-            
-        driver.quit()
-        return scraped_data
+            except Exception as inner_error:
+                logger.warning(f"Error processing video container: {inner_error}")
+
+        return videos
+
+    def _scrape_video(self, driver, video):
+        """
+        Combine a search result with the detailed metadata of its video page.
+        The page is fetched over plain HTTP first; the browser is only used when
+        the response does not contain the metadata.
+        """
+        if self.http_fetch:
+            if self.rate_limiter:
+                self.rate_limiter.wait()
+            metadata = fetch_video_metadata(video["video_link"], self.base_url)
+            if metadata:
+                logger.info(f"Fetched detailed video by {video['user_id']}")
+                return {**video, **metadata}
+
+        try:
+            self._open(driver, video["video_link"])
+
+            # Extended metadata extraction
+            metadata = self._extract_video_metadata(driver)
+
+            logger.info(f"Scraped detailed video by {video['user_id']}")
+            return {**video, **metadata}
+
+        except Exception as metadata_error:
+            logger.error(f"Error extracting video metadata: {metadata_error}")
+            return None
     
     def _extract_video_metadata(self, driver):
         """Extract comprehensive video metadata."""
@@ -241,10 +429,10 @@ class tiktok_scraper:
                 }
             
             except Exception as author_error:
-                print(f"Could not extract full author info: {author_error}")
+                logger.warning(f"Could not extract full author info: {author_error}")
         
         except Exception as metadata_error:
-            print(f"Error in metadata extraction: {metadata_error}")
+            logger.error(f"Error in metadata extraction: {metadata_error}")
         
         return metadata
     
@@ -283,7 +471,7 @@ class tiktok_scraper:
                 EC.presence_of_element_located((By.ID, "captcha-verify-container-main-page"))
             )
 
-            print("CAPTCHA detected.")
+            logger.info("CAPTCHA detected.")
 
             # Try clicking the close button if it exists
             close_button = WebDriverWait(driver, 5).until(
@@ -291,142 +479,189 @@ class tiktok_scraper:
             )
             time.sleep(5)
             close_button.click()
-            print("CAPTCHA closed successfully.")
+            logger.info("CAPTCHA closed successfully.")
 
         except TimeoutException:
-            print("No CAPTCHA detected.")
+            logger.info("No CAPTCHA detected.")
         except Exception as e:
-            print(f"Error closing CAPTCHA: {e}")
+            logger.warning(f"Error closing CAPTCHA: {e}")
             
     def convert_to_int(self, value):
         """Convert TikTok-style numbers like '42.8K' to integers."""
-        if value in ["N/A", None, ""]:
-            return 0
-        value = value.upper().replace(",", "")  # Remove commas for thousands
-        if "K" in value:
-            return int(float(value.replace("K", "")) * 1000)
-        elif "M" in value:
-            return int(float(value.replace("M", "")) * 1_000_000)
-        elif "B" in value:
-            return int(float(value.replace("B", "")) * 1_000_000_000)
-        return int(value)
+        return convert_to_int(value)
     
+# Each scraping process keeps one scraper and one Chrome instance for its whole lifetime
+_worker_scraper = None
+_worker_driver = None
+
+def _init_worker(headless, base_url, rate_limiter, http_fetch):
+    global _worker_scraper, _worker_driver
+    _worker_scraper = tiktok_scraper(headless=headless, base_url=base_url, rate_limiter=rate_limiter, http_fetch=http_fetch)
+    _worker_driver = _worker_scraper.get_driver()
+    Finalize(None, _worker_driver.quit, exitpriority=10)
+
+def _search_task(search_term, max_entries_pterm):
+    try:
+        return _worker_scraper._search_videos(_worker_driver, search_term, max_entries_pterm)
+    except Exception as outer_error:
+        logger.error(f"Overall scraping error for {search_term}: {outer_error}")
+        return None
+
+def _video_task(video):
+    return _worker_scraper._scrape_video(_worker_driver, video)
+
 from app import db, app
 from uuid import uuid4
-from sqlalchemy_serializer import SerializerMixin
-from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
 from datetime import datetime
+from sqlalchemy import text, insert
 from sqlalchemy.exc import SQLAlchemyError
+from models.tiktok import TikTokScrape, TikTokSnapshot
+from models.scrape import ScrapeRun, ScrapeRunTerm
+
+UPSERT_BATCH_SIZE = 1000
+
+UPSERT_COLUMNS = [
+    "id", "video_id", "search_term", "username", "profile_link", "avatar_url", "main_text", "video_link",
+    "upload_date", "likes_count", "comments_count", "views_count", "shares_count", "hashtags", "bookmark_count",
+    "created_at", "updated_at"
+]
+# Columns that keep the value of the first scrape when a video is seen again
+UPSERT_KEEP_COLUMNS = {"id", "video_id", "created_at"}
+
+SNAPSHOT_COLUMNS = ["video_id", "search_term", "likes_count", "comments_count", "shares_count", "views_count", "bookmark_count"]
+
+MSSQL_MERGE = text(f"""
+    MERGE INTO [TikTokScrape] WITH (HOLDLOCK) AS target
+    USING (VALUES ({", ".join(f":{column}" for column in UPSERT_COLUMNS)}))
+        AS source ({", ".join(UPSERT_COLUMNS)})
+    ON target.video_id = source.video_id
+    WHEN MATCHED THEN UPDATE SET
+        {", ".join(f"{column} = source.{column}" for column in UPSERT_COLUMNS if column not in UPSERT_KEEP_COLUMNS)}
+    WHEN NOT MATCHED THEN INSERT ({", ".join(UPSERT_COLUMNS)})
+        VALUES ({", ".join(f"source.{column}" for column in UPSERT_COLUMNS)});
+""")
+
+def _to_row(item, scraped_at):
+    # Convert hashtags to a string if they exist
+    hashtags_str = ','.join(item.get('hashtags', [])) if item.get('hashtags') else ''
+
+    # Parse upload_date, handle potential string format
+    upload_date = item.get('upload_date')
+    if isinstance(upload_date, str):
+        try:
+            upload_date = datetime.strptime(upload_date, '%Y-%m-%d')
+        except ValueError:
+            upload_date = datetime.min  # Default to minimum date if parsing fails
+
+    return {
+        "id": str(uuid4()),
+        "video_id": str(item.get("id")),  # Convert to string explicitly
+        "search_term": item.get("Search Term", ""),
+        "username": item.get("user_id", ""),
+        "profile_link": item.get("video_link", ""),  # Using video link as profile link
+        "avatar_url": "",  # Placeholder since no avatar_url in data
+        "upload_date": upload_date,
+        "video_link": item.get("video_link", ""),
+        "main_text": item.get("main_text", ""),
+        "likes_count": item.get("likes_count", 0),
+        "comments_count": item.get("comments_count", 0),
+        "views_count": item.get("views_count", 0),
+        "shares_count": item.get("shares_count", 0),
+        "hashtags": hashtags_str,
+        "bookmark_count": item.get("bookmark_count", 0),
+        "created_at": scraped_at,
+        "updated_at": scraped_at
+    }
+
+def upsert_tiktok_rows(connection, rows):
+    """
+    Insert or update `rows` keyed on their video_id in batches of UPSERT_BATCH_SIZE.
+    MSSQL uses a MERGE executed as one parameter array per batch (fast_executemany);
+    SQLite and PostgreSQL use INSERT ... ON CONFLICT DO UPDATE.
+    """
+    dialect = connection.dialect.name
+    table = TikTokScrape.__table__
+
+    if dialect == "mssql":
+        statement = MSSQL_MERGE
+    elif dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.video_id],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS if column not in UPSERT_KEEP_COLUMNS}
+        )
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        connection.execute(statement, rows[start:start + UPSERT_BATCH_SIZE])
 
-class TikTokScrape(db.Model, SerializerMixin):
-    __tablename__ = "TikTokScrape"
-
-    id = db.Column(UNIQUEIDENTIFIER, primary_key=True, default=lambda: str(uuid4()))
-    video_id = db.Column(db.String(100), nullable=False, unique=True)
-    search_term = db.Column(db.String(100), nullable=False)
-    username = db.Column(db.String(100), nullable=False)
-    profile_link = db.Column(db.String(500), nullable=False)
-    avatar_url = db.Column(db.String(500), nullable=True)
-    main_text = db.Column(db.Text, nullable=False)
-    video_link = db.Column(db.String(500), nullable=False)
-    upload_date = db.Column(db.DateTime, default=None)
-    likes_count = db.Column(db.Integer, default=0)
-    comments_count = db.Column(db.Integer, default=0)
-    shares_count = db.Column(db.Integer, default=0)
-    views_count = db.Column(db.Integer, default=0)
-    hashtags = db.Column(db.Text, nullable=True)
-    bookmark_count = db.Column(db.Integer, default=0)
-
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    serialize_rules = ('-created_at',)
+def append_tiktok_snapshots(connection, rows):
+    """Append one engagement snapshot per row to the TikTokSnapshot history."""
+    snapshots = [{
+        **{column: row[column] for column in SNAPSHOT_COLUMNS},
+        "scraped_at": row["updated_at"]
+    } for row in rows]
+    for start in range(0, len(snapshots), UPSERT_BATCH_SIZE):
+        connection.execute(insert(TikTokSnapshot.__table__), snapshots[start:start + UPSERT_BATCH_SIZE])
 
 def save_tiktok_data_to_db(data):
     """
     Save TikTok scrape data to the database
     
+    Videos that were already scraped are updated in place and videos that
+    are missing from `data` are kept, so readers never see an empty table.
+    Every scrape also appends the counters to the TikTokSnapshot history.
+
     Args:
         data (list): List of dictionaries containing TikTok video data
+
+    Returns:
+        bool: True once the data is committed, False if the save failed
     """
     if not isinstance(data, list):
-        print("ERROR: Data is not a list")
-        return
+        logger.error("Data is not a list")
+        return False
 
     try:
-        # Optional: Delete existing data before inserting new data
-        db.session.query(TikTokScrape).delete()  
-        db.session.commit()
-
-        for item in data:
-            # Convert hashtags to a string if they exist
-            hashtags_str = ','.join(item.get('hashtags', [])) if item.get('hashtags') else ''
-
-            # Parse upload_date, handle potential string format
-            upload_date = item.get('upload_date')
-            if isinstance(upload_date, str):
-                try:
-                    upload_date = datetime.strptime(upload_date, '%Y-%m-%d')
-                except ValueError:
-                    upload_date = datetime.min  # Default to minimum date if parsing fails
-
-            tiktok_entry = TikTokScrape(
-                video_id=str(item.get("id")),  # Convert to string explicitly
-                search_term=item.get("Search Term", ""),
-                username=item.get("user_id", ""),
-                profile_link=item.get("video_link", ""),  # Using video link as profile link
-                avatar_url="",  # Placeholder since no avatar_url in data
-                upload_date=upload_date,
-                video_link=item.get("video_link", ""),
-                main_text=item.get("main_text", ""),
-                likes_count=item.get("likes_count", 0),
-                comments_count=item.get("comments_count", 0),
-                views_count=item.get("views_count", 0),
-                shares_count=item.get("shares_count", 0),
-                hashtags=hashtags_str,
-                bookmark_count=item.get("bookmark_count", 0)
-            )
-            db.session.add(tiktok_entry)
+        scraped_at = datetime.utcnow()
+        # The same video can be returned for several search terms; the last one wins
+        rows = list({row["video_id"]: row for row in (_to_row(item, scraped_at) for item in data)}.values())
 
+        connection = db.session.connection()
+        upsert_tiktok_rows(connection, rows)
+        append_tiktok_snapshots(connection, rows)
         db.session.commit()
-        print(f"✅ {len(data)} records successfully saved to Azure SQL")
+        logger.info(f"{len(rows)} records successfully saved to Azure SQL")
+        return True
 
     except SQLAlchemyError as e:
         db.session.rollback()  # Rollback in case of failure
-        print("❌ ERROR: Could not save data to Azure SQL:", str(e))
-        # Optionally, log the full error for debugging
-        import traceback
-        traceback.print_exc()
-        
+        logger.exception(f"Could not save data to Azure SQL: {e}")
+        return False
+
 # Example usage
 if __name__ == "__main__":
-    engine = create_engine(Configuration.SQLALCHEMY_DATABASE_URI)
-    Session = sessionmaker(bind=engine)
-    
-    scraper = tiktok_scraper()
-    results = scraper.scrape_tiktok_search(search_terms=None, max_entries_pterm=6) #, "Fashion", "Home and kitchen", "Books", "Pets"])
-    print(f"Total videos scraped: {len(results)}")
-    
-    import json
-
-    # Open the file in write mode ('w')
-    with open('output.txt', 'w', encoding='utf-8') as file:
-        for line in results:
-            # Convert the dictionary to a string using json.dumps
-            file.write(json.dumps(line) + "\n")
+    import argparse
 
-    print("Data has been written to output.txt line by line")
-    import json
+    parser = argparse.ArgumentParser(description="Scrape TikTok search results into the database.")
+    parser.add_argument("search_terms", nargs="*", help="Search terms to scrape (defaults to Books, Skincare and Fashion)")
+    parser.add_argument("--max-entries", type=int, default=6, help="Videos to scrape per search term")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume an interrupted scrape run")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-# # Open the file in read mode ('r')
-#     with open('output.txt', 'r', encoding='utf-8') as file:
-#         # Read all lines and parse each line from JSON to a dictionary
-#         results = [json.loads(line.strip()) for line in file]
-
-#     print("Data has been read from output.txt:", results)
-
-
-
-    # Save to database
+    scraper = tiktok_scraper()
     with app.app_context():
-        save_tiktok_data_to_db(results)
-        
\ No newline at end of file
+        run = scraper.scrape_tiktok_search_checkpointed(
+            search_terms=args.search_terms or None,
+            max_entries_pterm=args.max_entries,
+            run_id=args.resume
+        )
+        print(f"Scrape run {run.id} finished with status {run.status}")
+        for term in run.terms:
+            print(f"{term.search_term}: {len(term.scraped)} videos ({term.status})")
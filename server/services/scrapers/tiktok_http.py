@@ -0,0 +1,134 @@
+import os
+import json
+import logging
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_HTTP_TIMEOUT = int(os.getenv("SCRAPER_HTTP_TIMEOUT", 10))
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/134.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session = None
+
+def get_session():
+    """Return the pooled HTTP session of this process."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=1)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+def convert_to_int(value):
+    """Convert TikTok-style numbers like '42.8K' to integers."""
+    if value in ["N/A", None, ""]:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = value.upper().replace(",", "")  # Remove commas for thousands
+    if "K" in value:
+        return int(float(value.replace("K", "")) * 1000)
+    elif "M" in value:
+        return int(float(value.replace("M", "")) * 1_000_000)
+    elif "B" in value:
+        return int(float(value.replace("B", "")) * 1_000_000_000)
+    return int(value)
+
+def _find_item_struct(soup):
+    """Return the itemStruct of the video from the JSON state embedded in the page."""
+    script = soup.find("script", id="__UNIVERSAL_DATA_FOR_REHYDRATION__")
+    if script and script.string:
+        data = json.loads(script.string)
+        item = data.get("__DEFAULT_SCOPE__", {}).get("webapp.video-detail", {}).get("itemInfo", {}).get("itemStruct")
+        if item:
+            return item
+
+    script = soup.find("script", id="SIGI_STATE")
+    if script and script.string:
+        data = json.loads(script.string)
+        items = data.get("ItemModule", {})
+        if items:
+            return next(iter(items.values()))
+    return None
+
+def _parse_item_struct(item, base_url):
+    stats = item.get("stats", {})
+    author = item.get("author", {})
+    if isinstance(author, str):
+        author = {"uniqueId": author, "avatarThumb": item.get("avatarThumb")}
+    username = author.get("uniqueId")
+    return {
+        "likes_count": convert_to_int(stats.get("diggCount")),
+        "comments_count": convert_to_int(stats.get("commentCount")),
+        "views_count": convert_to_int(stats.get("playCount")),
+        "bookmark_count": convert_to_int(stats.get("collectCount")),
+        "shares_count": convert_to_int(stats.get("shareCount")),
+        "duration": item.get("video", {}).get("duration"),
+        "author_info": {
+            "profile_link": f"{base_url}/@{username}" if username else None,
+            "avatar_url": author.get("avatarThumb"),
+            "username": author.get("nickname") or username
+        }
+    }
+
+def _parse_dom(soup):
+    """Read the counters from server-rendered markup, using the selectors of the Selenium extractor."""
+    def count(selector):
+        element = soup.select_one(selector)
+        return convert_to_int(element.get_text(strip=True)) if element else None
+
+    likes_count = count('strong[data-e2e="like-count"]')
+    if likes_count is None:
+        return None
+
+    metadata = {
+        "likes_count": likes_count,
+        "comments_count": count('strong[data-e2e="comment-count"]') or 0,
+        "views_count": count('strong[data-e2e="video-views"]') or 0,
+        "bookmark_count": count('strong[data-e2e="undefined-count"]') or 0,
+        "shares_count": count('strong[data-e2e="share-count"]') or 0,
+        "duration": None,
+        "author_info": {}
+    }
+    author_link = soup.select_one('a[data-e2e="video-author-avatar"]')
+    avatar_img = soup.select_one('div[class*="DivAvatarActionItemContainer"] img[class*="ImgAvatar"]')
+    if author_link and avatar_img:
+        metadata["author_info"] = {
+            "profile_link": author_link.get("href"),
+            "avatar_url": avatar_img.get("src"),
+            "username": avatar_img.get("alt")
+        }
+    return metadata
+
+def parse_video_metadata(html, base_url="https://www.tiktok.com"):
+    """
+    Extract the video counters and author fields from the HTML of a video page.
+    Returns None when the page does not contain them (e.g. a CAPTCHA page).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    try:
+        item = _find_item_struct(soup)
+    except (ValueError, AttributeError):
+        item = None
+    if item:
+        return _parse_item_struct(item, base_url)
+    return _parse_dom(soup)
+
+def fetch_video_metadata(url, base_url="https://www.tiktok.com"):
+    """Fetch a video page over plain HTTP and parse its metadata. Returns None on failure."""
+    try:
+        response = get_session().get(url, timeout=SCRAPER_HTTP_TIMEOUT)
+        response.raise_for_status()
+        return parse_video_metadata(response.text, base_url)
+    except Exception as e:
+        logger.warning(f"HTTP metadata extraction failed for {url}: {e}")
+        return None
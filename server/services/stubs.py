@@ -0,0 +1,176 @@
+"""
+Deterministic local stand-ins for the external services, used when a provider
+is set to "stub" (see services/tools.py). Every stub waits for a configurable
+latency and can fail a configurable share of its calls:
+
+    STUB_LATENCY_MS, STUB_JITTER_MS, STUB_ERROR_RATE, STUB_SEED
+
+Each setting can be overridden per service, e.g. STUB_LLM_LATENCY_MS or
+STUB_DALLE_ERROR_RATE. Outputs, jitter and injected errors are derived from a
+hash of the input, so the same request always behaves the same way.
+"""
+import os
+import time
+import hashlib
+import threading
+from types import SimpleNamespace
+from typing import get_origin
+
+# 1x1 transparent PNG, served as a data: URL so the media helpers can "download" it offline
+STUB_IMAGE = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+
+class StubServiceError(Exception):
+    pass
+
+class StubBehavior:
+    def __init__(self, service):
+        self.service = service
+        self.latency = self._setting("LATENCY_MS", 0) / 1000
+        self.jitter = self._setting("JITTER_MS", 0) / 1000
+        self.error_rate = self._setting("ERROR_RATE", 0)
+        self.seed = os.getenv(f"STUB_{service.upper()}_SEED", os.getenv("STUB_SEED", "0"))
+
+    def _setting(self, name, default):
+        value = os.getenv(f"STUB_{self.service.upper()}_{name}", os.getenv(f"STUB_{name}", default))
+        return float(value)
+
+    def draw(self, key, salt=""):
+        """A number in [0, 1) derived from `key`."""
+        digest = hashlib.sha256(f"{self.seed}:{self.service}:{salt}:{key}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+    def call(self, key):
+        """Simulate the latency of a call for `key` and raise if it was chosen to fail."""
+        delay = self.latency + (self.draw(key, "jitter") * 2 - 1) * self.jitter
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and self.draw(key, "error") < self.error_rate:
+            raise StubServiceError(f"Injected {self.service} failure")
+
+def _fake_value(annotation, name, digest):
+    if annotation is int:
+        return 5 + int(digest[:2], 16) % 5
+    if get_origin(annotation) is list:
+        return [f"#{name.rstrip('s')}{digest[index * 4:index * 4 + 4]}" for index in range(3)]
+    return f"Stub {name} {digest[:16]}"
+
+class StubStructuredModel:
+    def __init__(self, behavior, schema):
+        self.behavior = behavior
+        self.schema = schema
+
+    def invoke(self, prompt, config=None, **kwargs):
+        prompt = str(prompt)
+        self.behavior.call(prompt)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return self.schema(**{
+            name: _fake_value(field.annotation, name, digest)
+            for name, field in self.schema.model_fields.items()
+        })
+
+class StubChatModel:
+    """Chat model whose structured output is filled with values derived from the prompt."""
+    def __init__(self):
+        self.behavior = StubBehavior("llm")
+
+    def with_structured_output(self, schema, **kwargs):
+        return StubStructuredModel(self.behavior, schema)
+
+    def invoke(self, prompt, config=None, **kwargs):
+        prompt = str(prompt)
+        self.behavior.call(prompt)
+        return SimpleNamespace(content=f"Stub response {hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]}")
+
+class StubImages:
+    def __init__(self, behavior):
+        self.behavior = behavior
+
+    def generate(self, model=None, prompt="", n=1, size=None, **kwargs):
+        self.behavior.call(prompt)
+        return SimpleNamespace(data=[SimpleNamespace(url=f"data:image/png;base64,{STUB_IMAGE}") for _ in range(n or 1)])
+
+class StubImageClient:
+    """Image client with the `images.generate` interface of the OpenAI client."""
+    def __init__(self):
+        self.images = StubImages(StubBehavior("dalle"))
+
+class StubSearchTool:
+    def __init__(self):
+        self.behavior = StubBehavior("search")
+
+    def invoke(self, query, config=None, **kwargs):
+        query = str(query)
+        self.behavior.call(query)
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        return ", ".join(
+            f"[snippet: Stub result {index} for {query}, title: Result {digest[index * 4:index * 4 + 4]}, link: https://example.com/{digest[index * 8:index * 8 + 8]}]"
+            for index in range(3)
+        )
+
+    run = invoke
+
+class StubContentSafetyClient:
+    """Content Safety client that rates every text as safe."""
+    def __init__(self):
+        self.behavior = StubBehavior("safety")
+
+    def analyze_text(self, options):
+        text = getattr(options, "text", str(options))
+        self.behavior.call(text)
+        return SimpleNamespace(categories_analysis=[
+            SimpleNamespace(category=category, severity=0) for category in ("Hate", "SelfHarm", "Sexual", "Violence")
+        ])
+
+class StubBlobClient:
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+
+    def upload_blob(self, data, length=None, overwrite=False, **kwargs):
+        self.service.behavior.call(f"upload:{self.name}")
+        size = len(data.read() if hasattr(data, "read") else data)
+        with self.service.lock:
+            self.service.blobs[self.name] = size
+
+    def delete_blob(self, **kwargs):
+        self.service.behavior.call(f"delete:{self.name}")
+        with self.service.lock:
+            self.service.blobs.pop(self.name, None)
+
+class StubContainerClient:
+    def __init__(self, service, container):
+        self.service = service
+        self.container = container
+
+    def delete_blobs(self, *names, raise_on_any_failure=True, **kwargs):
+        responses = []
+        for name in names:
+            try:
+                StubBlobClient(self.service, f"{self.container}/{name}").delete_blob()
+                responses.append(SimpleNamespace(status_code=202))
+            except StubServiceError:
+                if raise_on_any_failure:
+                    raise
+                responses.append(SimpleNamespace(status_code=500))
+        return iter(responses)
+
+class StubBlobServiceClient:
+    """In-memory Blob service that only records the size of every uploaded blob."""
+    def __init__(self):
+        self.behavior = StubBehavior("blob")
+        self.blobs = {}
+        self.lock = threading.Lock()
+
+    def get_blob_client(self, container, blob):
+        return StubBlobClient(self, f"{container}/{blob}")
+
+    def get_container_client(self, container):
+        return StubContainerClient(self, container)
+
+STUBS = {
+    "llm": StubChatModel,
+    "dalle": StubImageClient,
+    "search_tool": StubSearchTool,
+    "content_safety_client": StubContentSafetyClient,
+    "blob_service_client": StubBlobServiceClient,
+}
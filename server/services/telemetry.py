@@ -0,0 +1,129 @@
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+
+from app import db
+from models.workflow import WorkflowNodeRun
+
+TELEMETRY_FIELDS = ("ms", "retries", "prompt_tokens", "completion_tokens", "images")
+
+_handler_class = None
+
+def _token_usage(response):
+    """Prompt and completion tokens reported for an LLM call, by the provider or on the message."""
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens", 0) or 0, usage.get("completion_tokens", 0) or 0
+
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            prompt_tokens += metadata.get("input_tokens", 0)
+            completion_tokens += metadata.get("output_tokens", 0)
+    return prompt_tokens, completion_tokens
+
+def create_usage_handler():
+    """
+    A LangChain callback handler that adds up the tokens and failed LLM calls of
+    every workflow node. Pass it in the `callbacks` of the workflow config and
+    call `merge(final_state.telemetry)` once the run is done.
+    """
+    global _handler_class
+    if _handler_class is None:
+        from langchain_core.callbacks import BaseCallbackHandler
+
+        class UsageHandler(BaseCallbackHandler):
+            def __init__(self):
+                self.nodes = {}
+                self._runs = {}
+                self._lock = threading.Lock()
+
+            def _add(self, run_id, field, value):
+                with self._lock:
+                    node = self._runs.get(run_id)
+                    if node:
+                        usage = self.nodes.setdefault(node, {})
+                        usage[field] = usage.get(field, 0) + value
+
+            def _start(self, run_id, metadata):
+                node = (metadata or {}).get("langgraph_node")
+                if node:
+                    with self._lock:
+                        self._runs[run_id] = node
+
+            def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+                self._start(run_id, metadata)
+
+            def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+                self._start(run_id, metadata)
+
+            def on_llm_end(self, response, *, run_id, **kwargs):
+                prompt_tokens, completion_tokens = _token_usage(response)
+                self._add(run_id, "prompt_tokens", prompt_tokens)
+                self._add(run_id, "completion_tokens", completion_tokens)
+                with self._lock:
+                    self._runs.pop(run_id, None)
+
+            def on_llm_error(self, error, *, run_id, **kwargs):
+                self._add(run_id, "retries", 1)
+                with self._lock:
+                    self._runs.pop(run_id, None)
+
+            def merge(self, telemetry):
+                with self._lock:
+                    return {
+                        node: {**telemetry.get(node, {}), **self.nodes.get(node, {})}
+                        for node in {*telemetry, *self.nodes}
+                    }
+
+        _handler_class = UsageHandler
+    return _handler_class()
+
+def build_node_runs(organization_id, mode, telemetry):
+    """One WorkflowNodeRun row per node of a finished workflow run."""
+    return [
+        WorkflowNodeRun(
+            organization_id=organization_id,
+            mode=mode or "",
+            node=node,
+            **{field: int(values.get(field, 0)) for field in TELEMETRY_FIELDS}
+        ) for node, values in telemetry.items()
+    ]
+
+def record_workflow_telemetry(organization_id, mode, telemetry):
+    """Add the telemetry of a workflow run to the session, to be committed with its content."""
+    db.session.add_all(build_node_runs(organization_id, mode, telemetry))
+
+def get_workflow_telemetry(days=7, organization_id=None):
+    """Runs, time, retries, tokens and images per organization, mode and node over the last `days`."""
+    query = db.session.query(
+        WorkflowNodeRun.organization_id,
+        WorkflowNodeRun.mode,
+        WorkflowNodeRun.node,
+        func.count().label("runs"),
+        func.avg(WorkflowNodeRun.ms * 1.0).label("avg_ms"),
+        func.max(WorkflowNodeRun.ms).label("max_ms"),
+        *[func.sum(getattr(WorkflowNodeRun, field)).label(field) for field in TELEMETRY_FIELDS]
+    ).filter(WorkflowNodeRun.created_at >= datetime.utcnow() - timedelta(days=days))
+    if organization_id:
+        query = query.filter(WorkflowNodeRun.organization_id == organization_id)
+    rows = query.group_by(WorkflowNodeRun.organization_id, WorkflowNodeRun.mode, WorkflowNodeRun.node).all()
+
+    totals = {}
+    for row in rows:
+        totals[(row.organization_id, row.mode)] = totals.get((row.organization_id, row.mode), 0) + (row.ms or 0)
+
+    return [{
+        "organization_id": str(row.organization_id),
+        "mode": row.mode,
+        "node": row.node,
+        "runs": row.runs,
+        "avg_ms": round(row.avg_ms or 0, 1),
+        "max_ms": row.max_ms,
+        "time_share": round((row.ms or 0) / totals[(row.organization_id, row.mode)], 3) if totals[(row.organization_id, row.mode)] else 0,
+        "retries": row.retries or 0,
+        "prompt_tokens": row.prompt_tokens or 0,
+        "completion_tokens": row.completion_tokens or 0,
+        "images": row.images or 0
+    } for row in sorted(rows, key=lambda row: (str(row.organization_id), row.mode, -(row.ms or 0)))]
@@ -1,14 +1,21 @@
 import os
+import threading
 from dotenv import load_dotenv
-from openai import AzureOpenAI
-from langchain_openai import AzureChatOpenAI
-from azure.core.credentials import AzureKeyCredential
-from azure.ai.contentsafety import ContentSafetyClient
-from langchain_community.tools import DuckDuckGoSearchResults
 
 load_dotenv()
 
+# "azure" for the live services or "stub" for the offline fakes in services/stubs.py
+SERVICE_PROVIDER = os.getenv("SERVICE_PROVIDER", "azure")
+PROVIDER_SETTINGS = {
+    "llm": "CHAT_PROVIDER",
+    "dalle": "IMAGE_PROVIDER",
+    "search_tool": "SEARCH_PROVIDER",
+    "content_safety_client": "SAFETY_PROVIDER",
+    "blob_service_client": "BLOB_PROVIDER",
+}
+
 def init_azure_openai():
+    from langchain_openai import AzureChatOpenAI
     return AzureChatOpenAI(
         openai_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
         azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
@@ -16,16 +23,8 @@ def init_azure_openai():
         azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
     )
 
-llm = init_azure_openai()
-
-# try:
-#     response = llm.invoke("Tell me a joke.")
-#     print("Azure OpenAI Chat Model is working...")
-#     print(response)
-# except Exception as e:
-#     print(f"ERROR: {e}")
-
 def init_dalle_client():
+    from openai import AzureOpenAI
     return AzureOpenAI(
         api_key=os.getenv("AZURE_OPENAI_API_KEY"),
         azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
@@ -33,24 +32,65 @@ def init_dalle_client():
         azure_deployment=os.getenv("AZURE_DALLE_DEPLOYMENT_NAME")
     )
 
-dalle = init_dalle_client()
-
-# try:
-#     response = dalle.images.generate(
-#         model=os.getenv("AZURE_DALLE_DEPLOYMENT_NAME"),
-#         prompt="the city skyline",
-#         n=1
-#     )
-#     image_url = response.data[0].url
-#     print("Azure DALLE Model is working...")
-#     print(image_url)
-# except Exception as e:
-#     print(f"ERROR: {e}")
-
-search_tool = DuckDuckGoSearchResults()
+def init_search_tool():
+    from langchain_community.tools import DuckDuckGoSearchResults
+    return DuckDuckGoSearchResults()
 
 def init_content_safety_client():
+    from azure.core.credentials import AzureKeyCredential
+    from azure.ai.contentsafety import ContentSafetyClient
     return ContentSafetyClient(os.getenv("AZURE_CONTENT_SAFETY_ENDPOINT"), AzureKeyCredential(os.getenv("AZURE_CONTENT_SAFETY_KEY")))
 
-content_safety_client = init_content_safety_client()
-        
\ No newline at end of file
+def init_blob_service_client():
+    from azure.storage.blob import BlobServiceClient
+    return BlobServiceClient.from_connection_string(os.getenv("AZURE_STORAGE_CONNECTION_STRING"))
+
+def init_stub_client(name):
+    from services.stubs import STUBS
+    return STUBS[name]()
+
+def get_provider(name):
+    return os.getenv(PROVIDER_SETTINGS[name], SERVICE_PROVIDER)
+
+_client_factories = {
+    "llm": init_azure_openai,
+    "dalle": init_dalle_client,
+    "search_tool": init_search_tool,
+    "content_safety_client": init_content_safety_client,
+    "blob_service_client": init_blob_service_client,
+}
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_client(name):
+    """
+    Return the shared client registered under `name`, building it on first use.
+    Clients are thread-safe and shared by every request and job worker.
+    The configured provider decides between the live service and its stub.
+    """
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                if get_provider(name) == "stub":
+                    client = init_stub_client(name)
+                else:
+                    client = _client_factories[name]()
+                _clients[name] = client
+    return client
+
+def get_llm():
+    return get_client("llm")
+
+def get_dalle():
+    return get_client("dalle")
+
+def get_search_tool():
+    return get_client("search_tool")
+
+def get_content_safety_client():
+    return get_client("content_safety_client")
+
+def get_blob_service_client():
+    return get_client("blob_service_client")
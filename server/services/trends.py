@@ -0,0 +1,222 @@
+import os
+import re
+import click
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, cast, case, delete, insert, and_, Date
+
+from app import app, db
+from models.tiktok import TikTokScrape, TikTokSnapshot, TikTokTrend
+from services.cache import TTLCache
+
+SNAPSHOT_RAW_DAYS = int(os.getenv("SNAPSHOT_RAW_DAYS", 7))
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", 90))
+TRENDS_INDEX_DAYS = int(os.getenv("TRENDS_INDEX_DAYS", 7))
+TRENDS_INDEX_SIZE = int(os.getenv("TRENDS_INDEX_SIZE", 20))
+TRENDS_INDEX_MAX_AGE = int(os.getenv("TRENDS_INDEX_MAX_AGE", 24))
+
+METRICS = ["views_count", "likes_count", "comments_count", "shares_count", "bookmark_count"]
+ENGAGEMENT_METRICS = ["likes_count", "comments_count", "shares_count", "bookmark_count"]
+
+trends_index_cache = TTLCache("trends_index", maxsize=1, ttl=int(os.getenv("TRENDS_INDEX_CACHE_TTL", 300)))
+
+def _video_growth(since, until, search_term=None):
+    """
+    Counter growth of every video snapshotted in [since, until], measured from its
+    last snapshot before `since`. Videos without an earlier snapshot grow from zero
+    when they were uploaded inside the window, and from their first snapshot otherwise.
+    """
+    window = select(
+        TikTokSnapshot.video_id,
+        TikTokSnapshot.search_term,
+        *[func.max(getattr(TikTokSnapshot, metric)).label(metric) for metric in METRICS],
+        *[func.min(getattr(TikTokSnapshot, metric)).label(f"first_{metric}") for metric in METRICS]
+    ).where(
+        TikTokSnapshot.scraped_at >= since,
+        TikTokSnapshot.scraped_at <= until
+    ).group_by(TikTokSnapshot.video_id, TikTokSnapshot.search_term)
+    if search_term:
+        window = window.where(TikTokSnapshot.search_term == search_term)
+    window = window.subquery()
+
+    # Counters only grow, so the largest value before the window is the one of the last snapshot
+    before = select(
+        TikTokSnapshot.video_id,
+        TikTokSnapshot.search_term,
+        *[func.max(getattr(TikTokSnapshot, metric)).label(metric) for metric in METRICS]
+    ).where(
+        TikTokSnapshot.scraped_at < since,
+        TikTokSnapshot.video_id.in_(select(window.c.video_id))
+    ).group_by(TikTokSnapshot.video_id, TikTokSnapshot.search_term).subquery()
+
+    uploaded_in_window = TikTokScrape.upload_date >= since
+    return select(
+        window.c.video_id,
+        window.c.search_term,
+        *[(window.c[metric] - func.coalesce(
+            before.c[metric],
+            case((uploaded_in_window, 0), else_=window.c[f"first_{metric}"])
+        )).label(metric) for metric in METRICS]
+    ).select_from(window).outerjoin(before, and_(
+        before.c.video_id == window.c.video_id,
+        before.c.search_term == window.c.search_term
+    )).outerjoin(TikTokScrape, TikTokScrape.video_id == window.c.video_id).subquery()
+
+def _rates(totals, hours):
+    return {f"{metric}_per_hour": round((totals[metric] or 0) / hours, 2) for metric in METRICS}
+
+def get_search_term_growth(since, until=None):
+    """Total and hourly counter growth per search term between `since` and `until`."""
+    until = until or datetime.utcnow()
+    hours = max((until - since).total_seconds() / 3600, 1)
+    growth = _video_growth(since, until)
+
+    rows = db.session.execute(select(
+        growth.c.search_term,
+        func.count().label("videos"),
+        *[func.sum(growth.c[metric]).label(metric) for metric in METRICS]
+    ).group_by(growth.c.search_term)).all()
+
+    return sorted([{
+        "search_term": row.search_term,
+        "videos": row.videos,
+        **{metric: row._mapping[metric] or 0 for metric in METRICS},
+        **_rates(row._mapping, hours)
+    } for row in rows], key=lambda term: term["views_count"], reverse=True)
+
+def _hashtag_totals(since, until, search_term=None, by_term=False):
+    """Counter growth summed per hashtag, or per (search term, hashtag) when `by_term` is set."""
+    growth = _video_growth(since, until, search_term)
+
+    rows = db.session.execute(select(
+        growth.c.search_term,
+        TikTokScrape.hashtags,
+        *[growth.c[metric] for metric in METRICS]
+    ).join(growth, growth.c.video_id == TikTokScrape.video_id)).all()
+
+    hashtags = {}
+    for row in rows:
+        for hashtag in set(filter(None, (row.hashtags or "").split(","))):
+            key = (row.search_term, hashtag.lower()) if by_term else hashtag.lower()
+            totals = hashtags.setdefault(key, {"videos": 0, **{metric: 0 for metric in METRICS}})
+            totals["videos"] += 1
+            for metric in METRICS:
+                totals[metric] += row._mapping[metric] or 0
+    return hashtags
+
+def get_hashtag_growth(since, until=None, search_term=None, limit=50):
+    """Total and hourly counter growth per hashtag between `since` and `until`."""
+    until = until or datetime.utcnow()
+    hours = max((until - since).total_seconds() / 3600, 1)
+    hashtags = _hashtag_totals(since, until, search_term)
+
+    return sorted([
+        {"hashtag": hashtag, **totals, **_rates(totals, hours)} for hashtag, totals in hashtags.items()
+    ], key=lambda hashtag: hashtag["views_count"], reverse=True)[:limit]
+
+def build_trends_index(now=None):
+    """
+    Rebuild the TikTokTrend index: the TRENDS_INDEX_SIZE hashtags of every search
+    term with the fastest engagement growth over the last TRENDS_INDEX_DAYS.
+    Returns the number of indexed hashtags.
+    """
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=TRENDS_INDEX_DAYS)
+    hours = max((now - since).total_seconds() / 3600, 1)
+
+    terms = {}
+    for (search_term, hashtag), totals in _hashtag_totals(since, now, by_term=True).items():
+        terms.setdefault(search_term, []).append({
+            "search_term": search_term,
+            "hashtag": hashtag,
+            "videos": totals["videos"],
+            "views_per_hour": round(totals["views_count"] / hours, 2),
+            "engagement_per_hour": round(sum(totals[metric] for metric in ENGAGEMENT_METRICS) / hours, 2),
+            "computed_at": now
+        })
+
+    rows = []
+    for trends in terms.values():
+        trends.sort(key=lambda trend: (trend["engagement_per_hour"], trend["views_per_hour"], trend["videos"]), reverse=True)
+        for rank, trend in enumerate(trends[:TRENDS_INDEX_SIZE], start=1):
+            rows.append({**trend, "rank": rank})
+
+    db.session.execute(delete(TikTokTrend))
+    if rows:
+        db.session.execute(insert(TikTokTrend), rows)
+    db.session.commit()
+    trends_index_cache.clear()
+    return len(rows)
+
+def get_trends_index():
+    """The trends index grouped by lowercased search term, cached in memory."""
+    index = trends_index_cache.get("index")
+    if index is None:
+        index = {}
+        for trend in db.session.execute(select(TikTokTrend).order_by(TikTokTrend.search_term, TikTokTrend.rank)).scalars():
+            entry = index.setdefault(trend.search_term.lower(), {
+                "search_term": trend.search_term,
+                "computed_at": trend.computed_at,
+                "hashtags": []
+            })
+            entry["hashtags"].append({
+                "hashtag": trend.hashtag,
+                "videos": trend.videos,
+                "views_per_hour": trend.views_per_hour,
+                "engagement_per_hour": trend.engagement_per_hour
+            })
+        trends_index_cache.set("index", index)
+    return index
+
+def find_trends(*texts):
+    """Entries of the trends index, no older than TRENDS_INDEX_MAX_AGE hours, whose search term occurs in `texts`."""
+    text = " ".join(text.lower() for text in texts if text)
+    if not text:
+        return []
+    cutoff = datetime.utcnow() - timedelta(hours=TRENDS_INDEX_MAX_AGE)
+    return [
+        entry for search_term, entry in get_trends_index().items()
+        if entry["computed_at"] >= cutoff and re.search(rf"\b{re.escape(search_term)}\b", text)
+    ]
+
+def downsample_snapshots(now=None):
+    """
+    Apply the snapshot retention policy: keep every snapshot for SNAPSHOT_RAW_DAYS,
+    then only the last snapshot of each video per day, and drop everything older
+    than SNAPSHOT_RETENTION_DAYS. Returns the number of deleted snapshots.
+    """
+    now = now or datetime.utcnow()
+    raw_cutoff = now - timedelta(days=SNAPSHOT_RAW_DAYS)
+    retention_cutoff = now - timedelta(days=SNAPSHOT_RETENTION_DAYS)
+
+    expired = db.session.execute(
+        delete(TikTokSnapshot).where(TikTokSnapshot.scraped_at < retention_cutoff)
+    ).rowcount
+
+    if db.engine.dialect.name == "sqlite":
+        day = func.date(TikTokSnapshot.scraped_at)
+    else:
+        day = cast(TikTokSnapshot.scraped_at, Date)
+    latest_per_day = select(func.max(TikTokSnapshot.id)).where(
+        TikTokSnapshot.scraped_at < raw_cutoff
+    ).group_by(TikTokSnapshot.video_id, day)
+    downsampled = db.session.execute(
+        delete(TikTokSnapshot).where(
+            TikTokSnapshot.scraped_at < raw_cutoff,
+            TikTokSnapshot.id.not_in(latest_per_day)
+        )
+    ).rowcount
+
+    db.session.commit()
+    return expired + downsampled
+
+@app.cli.command('downsample-snapshots')
+def downsample_snapshots_command():
+    """Apply the retention policy to the TikTok engagement snapshots."""
+    deleted = downsample_snapshots()
+    click.echo(f"Deleted {deleted} snapshots.")
+
+@app.cli.command('build-trends-index')
+def build_trends_index_command():
+    """Rebuild the index of the fastest growing hashtags per search term."""
+    indexed = build_trends_index()
+    click.echo(f"Indexed {indexed} hashtags.")
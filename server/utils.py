@@ -1,16 +1,56 @@
 import os
+import json
 import uuid
+import base64
 from functools import wraps
+from datetime import date, datetime
+from urllib.request import urlopen
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from flask import request, jsonify, session
-from azure.storage.blob import BlobServiceClient
 
+from app import db
 from models.user import User
+from services.cache import TTLCache
+from services.tools import get_blob_service_client
 
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
 AZURE_CONTAINER_NAME = os.getenv("AZURE_CONTAINER_NAME")
 AZURE_STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
+AZURE_STORAGE_BASE_URL = os.getenv("AZURE_STORAGE_BASE_URL", f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net")
+AZURE_CONTAINER_URL = f"{AZURE_STORAGE_BASE_URL}/{AZURE_CONTAINER_NAME}"
 
-blob_service_client = BlobServiceClient.from_connection_string(AZURE_STORAGE_CONNECTION_STRING)
+MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", 4))
+MEDIA_DOWNLOAD_TIMEOUT = int(os.getenv("MEDIA_DOWNLOAD_TIMEOUT", 30))
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", 50))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 200))
+
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 30))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 4096))
+
+_media_executor = ThreadPoolExecutor(max_workers=MEDIA_WORKERS, thread_name_prefix="media")
+
+Principal = namedtuple('Principal', ['id', 'type', 'organization_id'])
+
+principal_cache = TTLCache("principals", maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+def get_principal(user_id):
+    principal = principal_cache.get(str(user_id))
+    if principal is None:
+        row = db.session.query(User.id, User.type, User.organization_id).filter_by(id=user_id).first()
+        if not row:
+            return None
+        principal = Principal(row.id, row.type, row.organization_id)
+        principal_cache.set(str(user_id), principal)
+    return principal
+
+def invalidate_principal(*user_ids):
+    for user_id in user_ids:
+        principal_cache.delete(str(user_id))
+
+def get_current_user():
+    return User.query.filter_by(id=request.user.id).first()
 
 def auth_required(f):
     @wraps(f)
@@ -18,10 +58,10 @@ def auth_required(f):
         user_id = session.get('user_id')
         if not user_id:
             return jsonify({"error": "UNAUTHORIZED"}), 401
-        user = User.query.filter_by(id=user_id).first()
-        if not user:
+        principal = get_principal(user_id)
+        if not principal:
             return jsonify({"error": "UNAUTHORIZED"}), 401
-        request.user = user
+        request.user = principal
         return f(*args, **kwargs)
     return decorated_function
 
@@ -34,25 +74,30 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def upload_image_to_azure(image, directory, isGenerated=False):
+def upload_image_to_azure(image, directory, isGenerated=False, length=None):
     try:
         blob_name = f"{directory}/{uuid.uuid4()}.png" if isGenerated else f"{directory}/{uuid.uuid4()}-{image.filename}"
-        blob_client = blob_service_client.get_blob_client(container=AZURE_CONTAINER_NAME, blob=blob_name)
-        blob_client.upload_blob(image, overwrite=True)
-        image_url = f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net/{AZURE_CONTAINER_NAME}/{blob_name}"
+        blob_client = get_blob_service_client().get_blob_client(container=AZURE_CONTAINER_NAME, blob=blob_name)
+        blob_client.upload_blob(image, length=length, overwrite=True)
+        image_url = f"{AZURE_CONTAINER_URL}/{blob_name}"
         return image_url
     except Exception as e:
         print(f"Error uploading image to Azure: {e}")
         return None
     
+def get_blob_name(image_url):
+    base_url = f"{AZURE_CONTAINER_URL}/"
+    if not image_url or not image_url.startswith(base_url):
+        return None
+    return image_url[len(base_url):]
+
 def delete_image_from_azure(image_url):
     try:
-        base_url = f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net/{AZURE_CONTAINER_NAME}/"
-        if not image_url.startswith(base_url):
+        blob_name = get_blob_name(image_url)
+        if not blob_name:
             print("Invalid image URL format")
             return None
-        blob_name = image_url[len(base_url):] 
-        blob_client = blob_service_client.get_blob_client(container=AZURE_CONTAINER_NAME, blob=blob_name)
+        blob_client = get_blob_service_client().get_blob_client(container=AZURE_CONTAINER_NAME, blob=blob_name)
         blob_client.delete_blob()
         print(f"Deleted: {blob_name}")
         return True
@@ -60,3 +105,58 @@ def delete_image_from_azure(image_url):
         print(f"Error deleting image from Azure: {e}")
         return False
 
+def upload_images_to_azure(images, directory, isGenerated=False):
+    """
+    Upload several images concurrently on the media pool.
+    The returned URLs keep the order of `images`; failed uploads are dropped.
+    """
+    images = [image for image in images if image]
+    urls = _media_executor.map(lambda image: upload_image_to_azure(image, directory, isGenerated), images)
+    return [url for url in urls if url]
+
+def transfer_image_to_azure(url, directory):
+    """Stream an image from `url` straight into Blob Storage without buffering it in memory."""
+    try:
+        with urlopen(url, timeout=MEDIA_DOWNLOAD_TIMEOUT) as response:
+            return upload_image_to_azure(response, directory, True, length=getattr(response, "length", None))
+    except Exception as e:
+        print(f"Error transferring image to Azure: {e}")
+        return None
+
+def transfer_images_to_azure(urls, directory):
+    """
+    Download and upload several images concurrently on the media pool.
+    The returned URLs keep the order of `urls`; failed transfers are dropped.
+    """
+    uploaded = _media_executor.map(lambda url: transfer_image_to_azure(url, directory), urls)
+    return [url for url in uploaded if url]
+
+def get_page_size():
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def encode_cursor(*values):
+    values = [value.isoformat() if isinstance(value, (date, datetime)) else str(value) for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor, size=2):
+    """Decode a cursor of `size` values created by `encode_cursor`. Raises ValueError if it is malformed."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(value, str) for value in values):
+        raise ValueError("Invalid cursor.")
+    return values
+
+def get_fields(model):
+    """Return the sparse fieldset requested with `?fields=`, or None if every column was requested."""
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    columns = {column.name for column in model.__table__.columns}
+    requested = [field.strip() for field in fields.split(',') if field.strip() in columns]
+    return ['id'] + [field for field in requested if field != 'id']